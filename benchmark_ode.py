@@ -0,0 +1,96 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+# Лабораторные — отдельные скрипты, поэтому их папки добавляются в путь
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+for lab in ('lab2', 'lab3', 'lab4'):
+    sys.path.insert(0, os.path.join(ROOT_DIR, lab))
+
+import lab2
+import lab3
+import lab4
+import lab4s
+from common.benchmark import best_time, print_table
+from common.ode import ResultStore, integrate, run_scenario
+
+MODELS = {**lab2.MODELS, **lab3.MODELS, **lab4.MODELS, **lab4s.MODELS}
+
+# Для каждой модели — серия по одному параметру, одинаковая по размеру
+SWEEPS = {
+    'pendulum': dict(k=np.linspace(0.0, 1.0, 10), A=np.linspace(0.0, 1.5, 10), Omega=np.linspace(1.0, 4.0, 10)),
+    'lotka_volterra': dict(y0=[[x, y] for x in np.linspace(10, 80, 30) for y in np.linspace(3, 30, 30)]),
+    'coriolis': dict(omega=np.linspace(0.1, 3.0, 1000)),
+    'coriolis_rk': dict(omega=np.linspace(0.1, 3.0, 1000)),
+}
+T_SPANS = dict(pendulum=(0, 50), lotka_volterra=(0, 20), coriolis=(0, 20), coriolis_rk=(0, 40))
+
+
+def scenario(name, n_steps, method='rk4'):
+    sweep = {key: np.asarray(values).tolist() for key, values in SWEEPS[name].items()}
+    return dict(model=name, t_span=T_SPANS[name], n_steps=n_steps, method=method, sweep=sweep)
+
+
+def run_benchmark(n_steps=1000, repeats=3, workers=None):
+    for name, model in MODELS.items():
+        spec = scenario(name, n_steps)
+        result = run_scenario(spec, MODELS)
+        n = result['y'].shape[1]
+
+        # Контроль: пакет совпадает с поточечным расчетом
+        i = n // 2
+        single = integrate(
+            model['rhs'], result['y'][0, i], result['t'],
+            params={key: value[i] for key, value in result['params'].items()},
+        )
+        same = np.array_equal(single, result['y'][:, i])
+
+        # Поточечный цикл дорогой, поэтому замеряется на части точек и масштабируется
+        n_loop = max(1, n // 20)
+        t_loop = best_time(lambda: [
+            integrate(model['rhs'], result['y'][0, j], result['t'],
+                      params={key: value[j] for key, value in result['params'].items()})
+            for j in range(n_loop)
+        ], 1) * n / n_loop
+        t_batch = best_time(lambda: run_scenario(spec, MODELS), repeats)
+        t_pool = best_time(lambda: run_scenario(spec, MODELS, workers=workers, chunk_size=n // 4), 1)
+
+        print_table(
+            f"{name}: {n} траекторий, RK4, {n_steps} шагов (пакет = поточечно: {same})",
+            [
+                ("по одной траектории (оценка)", t_loop),
+                ("одним пакетом", t_batch),
+                ("пакет по частям в пуле процессов", t_pool),
+            ],
+            baseline="по одной траектории (оценка)",
+        )
+
+
+def run_store_demo(directory):
+    # Повторный запуск того же сценария читается из хранилища
+    store = ResultStore(directory)
+    spec = scenario('pendulum', 1000)
+    path = store.path(spec, MODELS['pendulum'])
+    if os.path.exists(path):
+        os.remove(path)
+    t_first = best_time(lambda: run_scenario(spec, MODELS, store=store), 1)
+    t_cached = best_time(lambda: run_scenario(spec, MODELS, store=store), 1)
+    print_table("Хранилище результатов (pendulum, 1000 траекторий):",
+                [("расчет и запись", t_first), ("чтение", t_cached)], baseline="расчет и запись")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Общий бенчмарк ОДУ-моделей лабораторных")
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--store', default=os.path.join(ROOT_DIR, '.ode_store'))
+    args = parser.parse_args()
+
+    run_benchmark(args.steps, workers=args.workers)
+    run_store_demo(args.store)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# Общий код для лабораторных работ
@@ -0,0 +1,33 @@
+import time
+
+import numpy as np
+
+# =============================================================================
+# Общие замеры времени для бенчмарков лабораторных
+# =============================================================================
+
+
+def best_time(func, repeats=5):
+    # Лучшее из нескольких повторов: меньше всего зависит от фоновой нагрузки
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def timed(func):
+    # Один прогон: результат и время, когда результат нужен дальше
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def print_table(title, rows, baseline=None):
+    # rows: [(название, время в секундах)], ускорение — относительно baseline
+    print(title)
+    reference = dict(rows)[baseline] if baseline is not None else None
+    for name, seconds in rows:
+        speedup = f" ({reference / seconds:.1f}x)" if reference is not None and name != baseline else ""
+        print(f"  {name:40s} {seconds * 1e3:10.2f} мс{speedup}")
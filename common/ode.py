@@ -0,0 +1,314 @@
+import functools
+import hashlib
+import inspect
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy
+from scipy.integrate import solve_ivp
+
+# =============================================================================
+# Общий каркас для ОДУ-экспериментов лабораторных
+# =============================================================================
+# Протокол правой части: rhs(t, y, **params) -> dy/dt той же формы, что y.
+# y имеет форму (..., d): последняя ось — компоненты состояния, остальные —
+# набор траекторий. Параметры — скаляры или массивы формы (n,), по одному
+# значению на траекторию. Если rhs принимает out=..., интеграторы с
+# фиксированным шагом пишут производную в заранее выделенный буфер.
+#
+# Модель лабораторной — словарь в ее реестре MODELS:
+#   dict(rhs=..., dim=d, params={имя: значение по умолчанию}, y0=[...])
+
+
+def accepts_out(rhs):
+    try:
+        return 'out' in inspect.signature(rhs).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+# --- Интеграторы с фиксированным шагом ---
+def euler(rhs, t, y0, params):
+    # Явный метод Эйлера на сетке t
+    y = np.empty((len(t),) + y0.shape)
+    y[0] = y0
+    dydt = np.empty_like(y0)
+    use_out = accepts_out(rhs)
+    for i in range(len(t) - 1):
+        h = t[i + 1] - t[i]
+        if use_out:
+            rhs(t[i], y[i], out=dydt, **params)
+        else:
+            dydt = rhs(t[i], y[i], **params)
+        np.multiply(h, dydt, out=y[i + 1])
+        y[i + 1] += y[i]
+    return y
+
+
+def rk4_stepper(rhs, y0, params=None):
+    """
+    Шаг классического RK4: step(t, y, h, out) пишет y(t + h) в out (out не y).
+
+    h — скаляр (тогда форма y любая) или массив формы y.shape[:-1]: свой
+    шаг у каждой траектории при состоянии по последней оси.
+    Для пакета (..., n, d) и rhs с out=... стадии считаются в буферах,
+    выделенных один раз. Для одного состояния (d,) буферы не окупаются —
+    время уходит на вызовы ufunc, а не на выделение памяти, — и стадии
+    считаются обычными выражениями. Оба пути побитово совпадают.
+    """
+    y0 = np.asarray(y0, dtype=float)
+    use_out = accepts_out(rhs)
+    # Параметры привязываются один раз, а не распаковываются на каждой стадии
+    f = functools.partial(rhs, **params) if params else rhs
+
+    if y0.ndim > 1 and use_out:
+        k1, k2, k3, k4, stage = (np.empty_like(y0) for _ in range(5))
+
+        def step(t, y, h, out):
+            h_y = h[..., None] if getattr(h, 'ndim', 0) else h
+            f(t, y, out=k1)
+            np.multiply(h_y / 2, k1, out=stage)
+            np.add(stage, y, out=stage)
+            f(t + h / 2, stage, out=k2)
+            np.multiply(h_y / 2, k2, out=stage)
+            np.add(stage, y, out=stage)
+            f(t + h / 2, stage, out=k3)
+            np.multiply(h_y, k3, out=stage)
+            np.add(stage, y, out=stage)
+            f(t + h, stage, out=k4)
+
+            # y + h/6 * (k1 + 2*k2 + 2*k3 + k4)
+            np.multiply(2, k2, out=stage)
+            np.add(stage, k1, out=stage)
+            np.multiply(2, k3, out=out)
+            np.add(out, stage, out=out)
+            np.add(out, k4, out=out)
+            np.multiply(out, h_y / 6, out=out)
+            np.add(out, y, out=out)
+            return out
+    else:
+        def step(t, y, h, out):
+            h_y = h[..., None] if getattr(h, 'ndim', 0) else h
+            t_half = t + h / 2
+            k1 = f(t, y)
+            k2 = f(t_half, y + h_y / 2 * k1)
+            k3 = f(t_half, y + h_y / 2 * k2)
+            k4 = f(t + h, y + h_y * k3)
+            out[...] = y + h_y / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            return out
+
+    return step
+
+
+def rk4(rhs, t, y0, params, h=None):
+    # Классический RK4 на сетке t. h — постоянный шаг, если сетка строилась
+    # как t0 + i·h (иначе берется t[i+1] − t[i], отличающийся на округление)
+    y = np.empty((len(t),) + y0.shape)
+    y[0] = y0
+    step = rk4_stepper(rhs, y0, params)
+    # Узлы как числа Python: скалярная арифметика с ними дешевле, чем с np.float64
+    times = t.tolist()
+    for i in range(len(t) - 1):
+        step(times[i], y[i], times[i + 1] - times[i] if h is None else h, y[i + 1])
+    return y
+
+
+def adaptive(method):
+    # Вложенные и неявные методы solve_ivp: набор траекторий разворачивается
+    # в плоский вектор, значения на сетке берутся из плотного вывода
+    def integrator(rhs, t, y0, params, rtol=1e-8, atol=1e-10):
+        shape = y0.shape
+
+        def ode(t_i, y_flat):
+            return np.ravel(rhs(t_i, y_flat.reshape(shape), **params))
+
+        sol = solve_ivp(ode, (t[0], t[-1]), np.ravel(y0), method=method, t_eval=t, rtol=rtol, atol=atol)
+        if not sol.success:
+            raise RuntimeError(f"{method}: {sol.message}")
+        return sol.y.T.reshape((len(t),) + shape)
+
+    integrator.__name__ = method
+    return integrator
+
+
+INTEGRATORS = dict(
+    euler=euler,
+    rk4=rk4,
+    RK45=adaptive('RK45'),
+    DOP853=adaptive('DOP853'),
+    Radau=adaptive('Radau'),
+    LSODA=adaptive('LSODA'),
+)
+
+
+def integrate(rhs, y0, t, method='rk4', params=None, **options):
+    """Траектории формы (len(t),) + y0.shape для набора начальных состояний."""
+    if method not in INTEGRATORS:
+        raise ValueError(f"Неизвестный метод: {method}. Доступны: {sorted(INTEGRATORS)}")
+    y0 = np.array(y0, dtype=float)
+    t = np.asarray(t, dtype=float)
+    return INTEGRATORS[method](rhs, t, y0, params or {}, **options)
+
+
+# --- Сценарии и серии ---
+# Сценарий — словарь:
+#   dict(model='pendulum', t_span=(0, 50), n_steps=3000, method='rk4',
+#        y0=[...], params={...}, sweep={'k': [0.1, 0.2], 'y0': [[...], [...]]})
+# sweep задает оси декартова произведения; все точки считаются одним пакетом.
+SCENARIO_DEFAULTS = dict(method='rk4', n_steps=1000, params={}, sweep={}, options={})
+
+
+def expand_scenario(scenario, model):
+    """Точки серии: начальные состояния (n, d) и параметры-массивы (n,)."""
+    spec = dict(SCENARIO_DEFAULTS, **scenario)
+    sweep = dict(spec['sweep'])
+    unknown = set(sweep) - set(model['params']) - {'y0'}
+    unknown |= set(spec['params']) - set(model['params'])
+    if unknown:
+        raise ValueError(f"Неизвестные параметры модели {spec['model']}: {sorted(unknown)}")
+
+    base = dict(model['params'], **spec['params'])
+    base_y0 = spec.get('y0', model['y0'])
+    names = list(sweep)
+    points = [dict(zip(names, values)) for values in itertools.product(*sweep.values())] or [{}]
+
+    y0 = np.array([point.get('y0', base_y0) for point in points], dtype=float)
+    params = {
+        name: np.array([point.get(name, value) for point in points], dtype=float)
+        for name, value in base.items()
+    }
+    return y0, params
+
+
+def _run_chunk(rhs, t, y0, params, method, options):
+    return integrate(rhs, y0, t, method=method, params=params, **options)
+
+
+def run_scenario(scenario, models, store=None, workers=None, chunk_size=None):
+    """
+    Расчет сценария одним пакетом (или частями в пуле процессов).
+
+    Возвращает словарь: t, y формы (n_t, n, d), params — массивы (n,) по
+    точкам серии. При переданном store результат берется из хранилища,
+    если сценарий уже считался тем же кодом.
+    """
+    model = models[scenario['model']]
+    if store is not None:
+        cached = store.load(scenario, model)
+        if cached is not None:
+            return cached
+
+    spec = dict(SCENARIO_DEFAULTS, **scenario)
+    y0, params = expand_scenario(scenario, model)
+    t = np.linspace(*spec['t_span'], spec['n_steps'] + 1)
+
+    n = len(y0)
+    if workers == 1 or chunk_size is None or n <= chunk_size:
+        y = integrate(model['rhs'], y0, t, method=spec['method'], params=params, **spec['options'])
+    else:
+        # Точки независимы, поэтому серия делится на части по траекториям
+        starts = range(0, n, chunk_size)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _run_chunk, model['rhs'], t, y0[s:s + chunk_size],
+                    {name: value[s:s + chunk_size] for name, value in params.items()},
+                    spec['method'], spec['options'],
+                )
+                for s in starts
+            ]
+            y = np.concatenate([future.result() for future in futures], axis=1)
+
+    result = dict(t=t, y=y, params=params)
+    if store is not None:
+        store.save(scenario, model, result)
+    return result
+
+
+# --- Хранилище результатов ---
+def _code_objects(code):
+    # Код функции и всех вложенных в нее функций и lambda
+    yield code
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            yield from _code_objects(const)
+
+
+def code_sources(func):
+    """
+    Исходники func и всех функций и классов ее модуля, которые она вызывает
+    (рекурсивно): правка вызываемой функции тоже меняет результат.
+    """
+    sources = {}
+    pending = [func]
+    while pending:
+        obj = pending.pop()
+        name = f"{obj.__module__}.{obj.__qualname__}"
+        if name in sources:
+            continue
+        sources[name] = inspect.getsource(obj)
+        if inspect.isclass(obj):
+            functions = [v for v in vars(obj).values() if inspect.isfunction(v)]
+        else:
+            functions = [obj]
+        for function in functions:
+            names = {n for code in _code_objects(function.__code__) for n in code.co_names}
+            for n in names:
+                value = function.__globals__.get(n)
+                if (inspect.isfunction(value) or inspect.isclass(value)) and value.__module__ == obj.__module__:
+                    pending.append(value)
+    return [sources[name] for name in sorted(sources)]
+
+
+def _array_digest(value):
+    value = np.ascontiguousarray(value, dtype=float)
+    return hashlib.sha256(str(value.shape).encode() + value.tobytes()).hexdigest()
+
+
+class ResultStore:
+    """
+    Результаты сценариев в .npz. Ключ — хеш сценария, развернутых начальных
+    состояний и параметров серии, исходников правой части (с вызываемыми ею
+    функциями модуля) и интегратора, версий NumPy и SciPy.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def key(self, scenario, model):
+        spec = dict(SCENARIO_DEFAULTS, **scenario)
+        y0, params = expand_scenario(scenario, model)
+        code = code_sources(model['rhs']) + code_sources(INTEGRATORS[spec['method']])
+        payload = dict(
+            scenario=spec,
+            y0=_array_digest(y0),
+            params={name: _array_digest(value) for name, value in params.items()},
+            code=hashlib.sha256('\n'.join(code).encode()).hexdigest(),
+            versions=dict(numpy=np.__version__, scipy=scipy.__version__),
+        )
+        text = json.dumps(payload, sort_keys=True, default=lambda v: np.asarray(v).tolist())
+        return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+    def path(self, scenario, model):
+        return os.path.join(self.directory, f"{scenario['model']}_{self.key(scenario, model)}.npz")
+
+    def load(self, scenario, model):
+        path = self.path(scenario, model)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            params = {name[len('param_'):]: data[name] for name in data.files if name.startswith('param_')}
+            return dict(t=data['t'], y=data['y'], params=params)
+
+    def save(self, scenario, model, result):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(scenario, model)
+        # Запись через временный файл, чтобы параллельные запуски
+        # не прочитали недописанный результат
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        params = {f"param_{name}": value for name, value in result['params'].items()}
+        np.savez(tmp, t=result['t'], y=result['y'], **params)
+        os.replace(tmp, path)
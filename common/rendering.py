@@ -0,0 +1,91 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+
+# =============================================================================
+# Отрисовка без дисплея
+# =============================================================================
+# Фигуры создаются напрямую через matplotlib.figure.Figure, без pyplot:
+# им не нужен ни дисплей, ни интерактивный backend, а savefig использует Agg.
+# Каждая задача описывает функцию draw(axes, *args, **kwargs), которая рисует
+# на готовых осях, и путь сохранения без расширения.
+
+# Кеш фигур процесса: (figsize, nrows, ncols) -> (fig, axes).
+# Задачи одного размера переиспользуют одну фигуру и ее оси.
+_FIGURES = {}
+
+
+def get_axes(figsize=(12, 7), nrows=1, ncols=1):
+    key = (tuple(figsize), nrows, ncols)
+    if key not in _FIGURES:
+        fig = Figure(figsize=figsize)
+        _FIGURES[key] = (fig, fig.subplots(nrows, ncols))
+    fig, axes = _FIGURES[key]
+
+    # Очистка после предыдущей задачи: оси, заголовок фигуры,
+    # а также добавленные задачей оси (например, colorbar)
+    own_axes = list(np.ravel(axes))
+    for ax in fig.axes:
+        if ax not in own_axes:
+            ax.remove()
+    for ax in own_axes:
+        ax.cla()
+    fig.texts.clear()
+    fig.legends.clear()
+    return fig, axes
+
+
+def render_job(job):
+    fig, axes = get_axes(job['figsize'], job['nrows'], job['ncols'])
+    job['draw'](axes, *job['args'], **job['kwargs'])
+    if job['tight']:
+        fig.tight_layout()
+
+    os.makedirs(os.path.dirname(job['path']) or '.', exist_ok=True)
+    paths = []
+    for fmt in job['formats']:
+        path = f"{job['path']}.{fmt}"
+        fig.savefig(path, dpi=job['dpi'], bbox_inches='tight')
+        paths.append(path)
+    return paths
+
+
+class RenderQueue:
+    """Очередь фигур, отрисовываемых пулом процессов."""
+
+    def __init__(self, formats=('png',), dpi=100):
+        self.formats = tuple(formats)
+        self.dpi = dpi
+        self.jobs = []
+
+    def add(self, path, draw, *args, figsize=(12, 7), nrows=1, ncols=1,
+            formats=None, dpi=None, tight=True, **kwargs):
+        # draw должна быть функцией уровня модуля, чтобы ее можно было
+        # передать в другой процесс
+        self.jobs.append(dict(
+            path=path, draw=draw, args=args, kwargs=kwargs,
+            figsize=figsize, nrows=nrows, ncols=ncols,
+            formats=self.formats if formats is None else tuple(formats),
+            dpi=self.dpi if dpi is None else dpi,
+            tight=tight,
+        ))
+
+    def run(self, workers=None):
+        # Возвращает список сохраненных файлов; workers=1 — без пула
+        jobs, self.jobs = self.jobs, []
+        if workers == 1 or len(jobs) <= 1:
+            results = [render_job(job) for job in jobs]
+        else:
+            # Задачи одного размера идут подряд и пачками, чтобы процесс
+            # переиспользовал фигуру из кеша
+            order = sorted(range(len(jobs)), key=lambda i: (jobs[i]['figsize'], jobs[i]['nrows'], jobs[i]['ncols']))
+            n_workers = workers or os.cpu_count() or 1
+            chunksize = max(1, len(jobs) // (4 * n_workers))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rendered = list(pool.map(render_job, [jobs[i] for i in order], chunksize=chunksize))
+            results = [None] * len(jobs)
+            for i, paths in zip(order, rendered):
+                results[i] = paths
+        return [path for paths in results for path in paths]
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+# Точка входа (python lab1/benchmark.py): common/ берется из корня репозитория
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.benchmark import best_time
+from lab1 import (
+    HAVE_NUMBA,
+    T_k_0,
+    eta_sin_kernel,
+    simulate_heater,
+    simulate_heater_jit,
+    thermostat_control,
+    thermostat_control_kernel,
+)
+
+# Параметры замера: стандартный прогон 2400 с при dt=0.1 (24 000 шагов)
+params = dict(P=100, m=0.3, A=0.01, k=10, T_min_C=60, T_max_C=80)
+repeats = 5
+
+
+def run_benchmark():
+    eta_sin = lambda T: 0.2 + 0.8 * np.sin((T - T_k_0) / 60 * np.pi)
+
+    loop = lambda: simulate_heater(**params, thermostat_control=thermostat_control, eta=eta_sin)
+    jit = lambda: simulate_heater_jit(**params, thermostat_control=thermostat_control_kernel, eta=eta_sin_kernel)
+
+    # Первый вызов включает компиляцию ядра
+    start = time.perf_counter()
+    _, T_jit = jit()
+    compile_time = time.perf_counter() - start
+    _, T_loop = loop()
+
+    t_loop = best_time(loop, repeats)
+    t_jit = best_time(jit, repeats)
+
+    print(f"Numba доступна: {HAVE_NUMBA}")
+    print(f"Совпадение результатов: {np.array_equal(T_loop, T_jit)}")
+    print(f"Цикл Python:          {t_loop * 1e3:8.2f} мс")
+    print(f"Компилируемое ядро:   {t_jit * 1e3:8.2f} мс (первый вызов {compile_time * 1e3:.0f} мс)")
+    print(f"Ускорение:            {t_loop / t_jit:8.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
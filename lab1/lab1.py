@@ -1,5 +1,26 @@
+import functools
+import hashlib
+import inspect
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.integrate import solve_ivp
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    # Без Numba ядра исполняются как обычные функции Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 # --- Константы ---
 sigma = 5.67e-8  # Постоянная Стефана-Больцмана, Вт/(м²·К⁴)
@@ -59,94 +80,575 @@ def simulate_heater(
 
     return t, T - T_k_0  # Возвращаем температуру в °C
 
-# --- Визуализация ---
-def plot_simulation(t, T, label):
-    plt.plot(t, T, label=label)
-    plt.xlabel('Время (с)')
-    plt.ylabel('Температура (°C)')
-    plt.grid(True)
-    plt.legend(loc='lower right')
+# --- Векторное управление терморегулятором ---
+def thermostat_control_batch(T, heating, T_min, T_max):
+    # Тот же гистерезис, что и в thermostat_control, но для массивов:
+    # heating — булева маска состояния нагревателей
+    return np.where(heating, T < T_max, T <= T_min)
 
-# --- Проведение экспериментов ---
-def run_experiments():
-    plt.figure(figsize=(12, 7))
+# --- Пакетная симуляция нагревателей ---
+def simulate_heater_batch(
+    P=100,            # мощность (Вт), скаляр или массив
+    m=0.3,            # масса (кг)
+    c=500,            # уд. теплоемкость (Дж/кг·К)
+    A=0.01,           # площадь теплообмена (м²)
+    k=10,             # коэфф. теплообмена (Вт/м²·К)
+    T_min_C=70,       # мин. температура терморегулятора (°C)
+    T_max_C=100,      # макс. температура терморегулятора (°C)
+    T0_C=20,          # начальная температура (°C)
+    T_env_C=20,       # температура среды (°C)
+    time=2400,        # общее время симуляции (с)
+    dt=0.1,           # шаг по времени (с)
+    thermostat_control = lambda T, heating, T_min, T_max: True, # векторная функция управления (маска)
+    eta=lambda T: 0.9 # КПД как векторная функция от температуры (ufunc)
+):
+    # Все параметры приводятся к одной форме (n_heaters,):
+    # каждый элемент — отдельный нагреватель со своим набором параметров
+    P, m, c, A, k, T_min_C, T_max_C, T0_C, T_env_C = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float))
+          for v in (P, m, c, A, k, T_min_C, T_max_C, T0_C, T_env_C))
+    )
+
+    # Перевод в Кельвины
+    T_min = T_min_C + T_k_0
+    T_max = T_max_C + T_k_0
+    T0 = T0_C + T_k_0
+    T_env = T_env_C + T_k_0
+
+    n_steps = int(time / dt)
+    T = np.zeros((P.size, n_steps))
+    t = np.linspace(0, time, n_steps)
+    T[:, 0] = T0
+    heating = np.ones(P.size, dtype=bool)
+    T_env4 = np.float_power(T_env, 4)
+
+    for i in range(1, n_steps):
+        current_T = T[:, i - 1]
+
+        # Управление терморегулятором (маска включенных нагревателей)
+        heating = np.broadcast_to(
+            np.asarray(thermostat_control(current_T, heating, T_min, T_max), dtype=bool),
+            current_T.shape,
+        )
+        thermostat_effect = heating.astype(float)
+
+        # Энергетические потоки (порядок операций как в simulate_heater).
+        # Векторный np.power на части входов расходится с libm pow на 1 ulp;
+        # np.float_power считает каждый элемент тем же pow, что и T**4 у скаляра
+        q_gen = P * eta(current_T) * dt * thermostat_effect
+        q_conv = k * A * (current_T - T_env) * dt
+        q_rad = sigma * A * (np.float_power(current_T, 4) - T_env4) * dt
+
+        delta_U = q_gen - q_conv - q_rad
+        dT = delta_U / (m * c)
+        T[:, i] = current_T + dT
+
+    return t, T - T_k_0  # t: (n_steps,), T: (n_heaters, n_steps) в °C
+
+# --- Потоковая симуляция: сводка по установившемуся циклу ---
+def simulate_heater_summary(
+    P=100,            # мощность (Вт)
+    m=0.3,            # масса (кг)
+    c=500,            # уд. теплоемкость (Дж/кг·К)
+    A=0.01,           # площадь теплообмена (м²)
+    k=10,             # коэфф. теплообмена (Вт/м²·К)
+    T_min_C=70,       # мин. температура терморегулятора (°C)
+    T_max_C=100,      # макс. температура терморегулятора (°C)
+    T0_C=20,          # начальная температура (°C)
+    T_env_C=20,       # температура среды (°C)
+    time=2400,        # максимальное время симуляции (с)
+    dt=0.1,           # шаг по времени (с)
+    thermostat_control=thermostat_control, # функция управления терморегулятором
+    eta=lambda T: 0.9, # КПД как функция от температуры
+    rtol=1e-3,        # допуск сходимости периода и скважности между циклами
+    min_cycles=3,     # минимальное число полных циклов перед остановкой
+    steady_tol=1e-6,  # порог |dT/dt| (К/с) для стационара без переключений
+):
+    # Та же физика, что в simulate_heater, но без хранения временного ряда:
+    # память O(1), остановка как только предельный цикл терморегулятора
+    # повторяется (или температура вышла на стационар без переключений).
+    T_min = T_min_C + T_k_0
+    T_max = T_max_C + T_k_0
+    T0 = T0_C + T_k_0
+    T_env = T_env_C + T_k_0
+
+    n_steps = int(time / dt)
+    current_T = T0
+    heating = True
+
+    # Накопители текущего цикла (цикл начинается с включения нагрева)
+    cycle_start = None
+    on_steps = 0
+    q_gen_sum = 0.0
+    T_peak = -np.inf
+    T_trough = np.inf
+    prev_period = None
+    prev_duty = None
+    cycles = 0
+    summary = None
+
+    i = 0
+    for i in range(1, n_steps):
+        new_heating = thermostat_control(current_T, heating, T_min, T_max)
+
+        if new_heating and not heating:
+            # Включение нагрева — граница цикла на узле i - 1
+            if cycle_start is not None:
+                period_steps = i - 1 - cycle_start
+                duty = on_steps / period_steps
+                cycles += 1
+                summary = dict(
+                    converged=False,
+                    cycles=cycles,
+                    period=period_steps * dt,  # шаг физики — dt, а не шаг сетки вывода
+                    duty_cycle=duty,
+                    mean_power=q_gen_sum / period_steps,
+                    T_peak_C=T_peak - T_k_0,
+                    T_trough_C=T_trough - T_k_0,
+                )
+                if (
+                    prev_period is not None
+                    and cycles >= min_cycles
+                    and abs(period_steps - prev_period) <= max(1, rtol * period_steps)
+                    and abs(duty - prev_duty) <= rtol + 1 / period_steps
+                ):
+                    summary['converged'] = True
+                    i -= 1  # узел i еще не вычислен
+                    break
+                prev_period, prev_duty = period_steps, duty
+            cycle_start = i - 1
+            on_steps = 0
+            q_gen_sum = 0.0
+            T_peak = -np.inf
+            T_trough = np.inf
+
+        heating = new_heating
+        thermostat_effect = 1 if heating else 0
+
+        # Энергетические потоки
+        q_gen = P * eta(current_T) * dt * thermostat_effect
+        q_conv = k * A * (current_T - T_env) * dt
+        q_rad = sigma * A * (current_T**4 - T_env**4) * dt
+
+        delta_U = q_gen - q_conv - q_rad
+        dT = delta_U / (m * c)
+        current_T = current_T + dT
 
-    # Все параметры одинаковы, кроме T_min_C и T_max_C
-    base_params = dict(P=100, m=0.3, A=0.01, k=10)
-    t1, T1 = simulate_heater(**base_params, T_min_C=60, T_max_C=80, thermostat_control= lambda current_T, heating, T_min, T_max : True)
-    plot_simulation(t1, T1, "P = 100 Вт, m = 0.3 кг, A = 0.01 м², k = 10 Вт/м²·К,")
+        on_steps += thermostat_effect
+        q_gen_sum += q_gen / dt
+        T_peak = max(T_peak, current_T)
+        T_trough = min(T_trough, current_T)
 
-    base_params = dict(P=100, m=0.6, A=0.01, k=10)
-    t2, T2 = simulate_heater(**base_params, T_min_C=70, T_max_C=90)
-    plot_simulation(t2, T2, "P = 100 Вт, m = 0.6 кг, A = 0.01 м², k = 10 Вт/м²·К")
+        if cycle_start is None and abs(dT) <= steady_tol * dt:
+            # Стационар без переключений терморегулятора
+            summary = dict(
+                converged=True,
+                cycles=0,
+                period=None,
+                duty_cycle=float(thermostat_effect),
+                mean_power=q_gen / dt,
+                T_peak_C=current_T - T_k_0,
+                T_trough_C=current_T - T_k_0,
+            )
+            break
 
-    base_params = dict(P=100, m=0.3, A=0.005, k=10)
-    t3, T3 = simulate_heater(**base_params, T_min_C=80, T_max_C=100)
-    plot_simulation(t3, T3, "P = 100 Вт, m = 0.6 кг, A = 0.005 м², k = 10 Вт/м²·К")
+    if summary is None:
+        summary = dict(
+            converged=False, cycles=0, period=None, duty_cycle=None,
+            mean_power=None, T_peak_C=None, T_trough_C=None,
+        )
+    summary['t_stop'] = i * dt
+    summary['n_steps'] = i + 1
+    summary['T_C'] = current_T - T_k_0
+    return summary
 
-    base_params = dict(P=150, m=0.3, A=0.01, k=10)
-    t4, T4 = simulate_heater(**base_params, T_min_C=90, T_max_C=110)
-    plot_simulation(t4, T4, "P = 150 Вт, m = 0.6 кг, A = 0.01 м², k = 10 Вт/м²·К")
+# --- Событийная симуляция нагревателя ---
+def simulate_heater_events(
+    P=100,            # мощность (Вт)
+    m=0.3,            # масса (кг)
+    c=500,            # уд. теплоемкость (Дж/кг·К)
+    A=0.01,           # площадь теплообмена (м²)
+    k=10,             # коэфф. теплообмена (Вт/м²·К)
+    T_min_C=70,       # мин. температура терморегулятора (°C)
+    T_max_C=100,      # макс. температура терморегулятора (°C)
+    T0_C=20,          # начальная температура (°C)
+    T_env_C=20,       # температура среды (°C)
+    time=2400,        # общее время симуляции (с)
+    thermostat=True,  # использовать гистерезисный терморегулятор (thermostat_control)
+    eta=lambda T: 0.9, # КПД как функция от температуры
+    t_eval=None,      # сетка времени для вывода (None — точки самого решателя)
+    method='DOP853',  # адаптивный метод высокого порядка
+    rtol=1e-9,        # относительная точность
+    atol=1e-9,        # абсолютная точность (К)
+):
+    # Каждая фаза (нагрев или остывание) интегрируется адаптивным методом
+    # до точного момента пересечения T_max / T_min, найденного как корень
+    # функции события. Шаг dt не нужен, перерегулирования нет.
+    T_min = T_min_C + T_k_0
+    T_max = T_max_C + T_k_0
+    T0 = T0_C + T_k_0
+    T_env = T_env_C + T_k_0
 
-    base_params = dict(P=100, m=0.3, A=0.01, k=5)
-    t5, T5 = simulate_heater(**base_params, T_min_C=100, T_max_C=120)
-    plot_simulation(t5, T5, "P = 100 Вт, m = 0.6 кг, A = 0.01 м², k = 5 Вт/м²·К")
+    def rhs(t, y, heating):
+        current_T = y[0]
+        q_gen = P * eta(current_T) * heating
+        q_conv = k * A * (current_T - T_env)
+        q_rad = sigma * A * (current_T**4 - T_env**4)
+        return [(q_gen - q_conv - q_rad) / (m * c)]
 
-    plt.title("Сравнение поведения нагревателя при разных параметрах")
+    def reach_T_max(t, y, heating):
+        return y[0] - T_max
+    reach_T_max.terminal = True
+    reach_T_max.direction = 1
+
+    def reach_T_min(t, y, heating):
+        return y[0] - T_min
+    reach_T_min.terminal = True
+    reach_T_min.direction = -1
+
+    segments = []
+    t0, y0 = 0.0, T0
+    heating = True
+    while t0 < time:
+        if thermostat:
+            heating = thermostat_control(y0, heating, T_min, T_max)
+            events = [reach_T_max if heating else reach_T_min]
+        else:
+            events = None
+
+        sol = solve_ivp(
+            rhs, (t0, time), [y0], method=method, events=events,
+            args=(heating,), dense_output=t_eval is not None, rtol=rtol, atol=atol,
+        )
+        segments.append(sol)
+        if sol.status != 1:  # фаза дошла до конца интервала
+            break
+
+        # Точка переключения: ставим температуру ровно на границу
+        t0 = sol.t_events[0][0]
+        y0 = T_max if heating else T_min
+        heating = not heating
+
+    if t_eval is None:
+        t = np.concatenate([segments[0].t] + [seg.t[1:] for seg in segments[1:]])
+        T = np.concatenate([segments[0].y[0]] + [seg.y[0, 1:] for seg in segments[1:]])
+        return t, T - T_k_0
+
+    # Пересэмплирование на заданную сетку по плотному выводу каждой фазы
+    t = np.asarray(t_eval, dtype=float)
+    T = np.empty_like(t)
+    bounds = np.array([seg.t[-1] for seg in segments])
+    idx = np.minimum(np.searchsorted(bounds, t, side='left'), len(segments) - 1)
+    for j, seg in enumerate(segments):
+        mask = idx == j
+        if np.any(mask):
+            T[mask] = seg.sol(t[mask])[0]
+    return t, T - T_k_0
+
+# --- Компилируемые ядра (Numba nopython) ---
+# Функции управления: (T, heating, T_min, T_max) -> bool
+# Функции КПД: (T) -> float
+# Пользовательские функции тоже нужно обернуть в njit.
+thermostat_control_kernel = njit(thermostat_control)
+
+@njit
+def always_heating_kernel(T, heating, T_min, T_max):
+    return True
+
+@njit
+def eta_const_kernel(T):
+    return 0.9
+
+@njit
+def eta_linear_min_kernel(T):
+    return 0.2 + min(0.8, 0.8 * (T - T_k_0) / 40)
+
+@njit
+def eta_sin_kernel(T):
+    return 0.2 + 0.8 * np.sin((T - T_k_0) / 60 * np.pi)
+
+@njit(cache=True)
+def _heater_kernel(P, m, c, A, k, T_min, T_max, T0, T_env, dt, control, eta, T):
+    # Тот же цикл, что в simulate_heater, но без возврата в интерпретатор
+    T[0] = T0
+    heating = True
+    # Степень 4.0, а не 4: целую степень Numba раскладывает в умножения,
+    # а вещественная идет через libm pow, как T**4 в simulate_heater
+    T_env4 = T_env ** 4.0
+    for i in range(1, T.shape[0]):
+        current_T = T[i - 1]
+
+        heating = control(current_T, heating, T_min, T_max)
+        thermostat_effect = 1 if heating else 0
+
+        q_gen = P * eta(current_T) * dt * thermostat_effect
+        q_conv = k * A * (current_T - T_env) * dt
+        q_rad = sigma * A * (current_T ** 4.0 - T_env4) * dt
+
+        delta_U = q_gen - q_conv - q_rad
+        dT = delta_U / (m * c)
+        T[i] = current_T + dT
+
+def simulate_heater_jit(
+    P=100,            # мощность (Вт)
+    m=0.3,            # масса (кг)
+    c=500,            # уд. теплоемкость (Дж/кг·К)
+    A=0.01,           # площадь теплообмена (м²)
+    k=10,             # коэфф. теплообмена (Вт/м²·К)
+    T_min_C=70,       # мин. температура терморегулятора (°C)
+    T_max_C=100,      # макс. температура терморегулятора (°C)
+    T0_C=20,          # начальная температура (°C)
+    T_env_C=20,       # температура среды (°C)
+    time=2400,        # общее время симуляции (с)
+    dt=0.1,           # шаг по времени (с)
+    thermostat_control=always_heating_kernel, # njit-функция управления
+    eta=eta_const_kernel, # njit-функция КПД
+):
+    # Перевод в Кельвины
+    T_min = T_min_C + T_k_0
+    T_max = T_max_C + T_k_0
+    T0 = T0_C + T_k_0
+    T_env = T_env_C + T_k_0
+
+    n_steps = int(time / dt)
+    T = np.zeros(n_steps)
+    t = np.linspace(0, time, n_steps)
+    _heater_kernel(
+        float(P), float(m), float(c), float(A), float(k),
+        float(T_min), float(T_max), float(T0), float(T_env), float(dt),
+        thermostat_control, eta, T,
+    )
+    return t, T - T_k_0  # Возвращаем температуру в °C
+
+# --- Именованные функции управления и КПД для серий расчетов ---
+# Лямбды нельзя ни передать в другой процесс, ни надежно хешировать,
+# поэтому в описаниях серий функции задаются по имени.
+def always_heating(T, heating, T_min, T_max):
+    return True
+
+def eta_const(T):
+    return 0.9
+
+def eta_linear_min(T):
+    return 0.2 + np.minimum(0.8, 0.8 * (T - T_k_0) / 40)
+
+def eta_sin(T):
+    return 0.2 + 0.8 * np.sin((T - T_k_0) / 60 * np.pi)
+
+CONTROLS = {
+    'always': always_heating,
+    'thermostat': thermostat_control_batch,
+}
+
+ETAS = {
+    'const': eta_const,
+    'linear_min': eta_linear_min,
+    'sin': eta_sin,
+}
+
+# --- Серии расчетов с кешем на диске ---
+SWEEP_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sweep_cache')
+
+SWEEP_DEFAULTS = dict(
+    P=100, m=0.3, c=500, A=0.01, k=10,
+    T_min_C=70, T_max_C=100, T0_C=20, T_env_C=20,
+    time=2400, dt=0.1,
+    thermostat_control='always', eta='const',
+)
+
+# Параметры, которые в пакетном расчете могут различаться у нагревателей
+_BATCH_PARAMS = ('P', 'm', 'c', 'A', 'k', 'T_min_C', 'T_max_C', 'T0_C', 'T_env_C')
+
+def param_grid(**axes):
+    # Декартово произведение осей: param_grid(P=[50, 100], k=[5, 10]) -> 4 точки
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+@functools.lru_cache(maxsize=None)
+def code_version(control, eta):
+    # Версия кода — хеш исходников всего, что влияет на траекторию. Исходники
+    # читаются один раз на пару (control, eta) за процесс, а не на каждую точку
+    funcs = (simulate_heater_batch, CONTROLS[control], ETAS[eta])
+    source = ''.join(inspect.getsource(func) for func in funcs)
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+def _normalize_point(point):
+    params = dict(SWEEP_DEFAULTS)
+    params.update(point)
+    unknown = set(params) - set(SWEEP_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Неизвестные параметры серии: {sorted(unknown)}")
+    for name, value in params.items():
+        if name not in ('thermostat_control', 'eta'):
+            params[name] = float(value)
+    return params
+
+def sweep_key(params):
+    payload = dict(params=params, code=code_version(params['thermostat_control'], params['eta']))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def _run_chunk(fixed, chunk):
+    # Один пакетный расчет для точек с общими time, dt, управлением и КПД
+    columns = {name: [params[name] for params in chunk] for name in _BATCH_PARAMS}
+    return simulate_heater_batch(
+        **columns,
+        time=fixed['time'],
+        dt=fixed['dt'],
+        thermostat_control=CONTROLS[fixed['thermostat_control']],
+        eta=ETAS[fixed['eta']],
+    )
+
+def run_sweep(
+    points,                  # список словарей параметров simulate_heater
+    base=None,               # общие для всех точек параметры
+    cache_dir=SWEEP_CACHE_DIR, # папка кеша (None — без кеша)
+    workers=None,            # число процессов (None — по числу ядер, 1 — без пула)
+    chunk_size=256,          # число нагревателей в одном пакетном расчете
+):
+    # Возвращает список (t, T) в порядке points. Считаются только точки,
+    # которых еще нет в кеше; остальные читаются с диска.
+    all_params = [_normalize_point({**(base or {}), **point}) for point in points]
+    keys = [sweep_key(params) for params in all_params]
+    results = [None] * len(points)
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        for i, key in enumerate(keys):
+            path = os.path.join(cache_dir, f"{key}.npz")
+            if os.path.exists(path):
+                with np.load(path) as data:
+                    results[i] = (data['t'], data['T'])
+
+    # Промахи кеша группируются по неварьируемым в пакете параметрам
+    groups = {}
+    for i, params in enumerate(all_params):
+        if results[i] is None:
+            fixed = (params['time'], params['dt'], params['thermostat_control'], params['eta'])
+            groups.setdefault(fixed, []).append(i)
+
+    tasks = []
+    for (time, dt, control, eta), indices in groups.items():
+        fixed = dict(time=time, dt=dt, thermostat_control=control, eta=eta)
+        for start in range(0, len(indices), chunk_size):
+            chunk_indices = indices[start:start + chunk_size]
+            tasks.append((chunk_indices, fixed, [all_params[i] for i in chunk_indices]))
+
+    if workers == 1 or len(tasks) <= 1:
+        outputs = [_run_chunk(fixed, chunk) for _, fixed, chunk in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_chunk, fixed, chunk) for _, fixed, chunk in tasks]
+            outputs = [future.result() for future in futures]
+
+    for (chunk_indices, _, _), (t, T) in zip(tasks, outputs):
+        for i, T_i in zip(chunk_indices, T):
+            results[i] = (t, T_i)
+            if cache_dir is not None:
+                path = os.path.join(cache_dir, f"{keys[i]}.npz")
+                tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+                np.savez(tmp_path, t=t, T=T_i)
+                os.replace(tmp_path, path)
+
+    return results
+
+# --- Визуализация ---
+def plot_simulation(t, T, label, ax=None):
+    ax = ax or plt.gca()
+    ax.plot(t, T, label=label)
+    ax.set_xlabel('Время (с)')
+    ax.set_ylabel('Температура (°C)')
+    ax.grid(True)
+    ax.legend(loc='lower right')
+
+# --- Описание экспериментов ---
+EXPERIMENTS = dict(
+    params=dict(
+        title="Сравнение поведения нагревателя при разных параметрах",
+        points=[
+            dict(P=100, m=0.3, A=0.01, k=10, T_min_C=60, T_max_C=80,
+                 label="P = 100 Вт, m = 0.3 кг, A = 0.01 м², k = 10 Вт/м²·К,"),
+            dict(P=100, m=0.6, A=0.01, k=10, T_min_C=70, T_max_C=90,
+                 label="P = 100 Вт, m = 0.6 кг, A = 0.01 м², k = 10 Вт/м²·К"),
+            dict(P=100, m=0.3, A=0.005, k=10, T_min_C=80, T_max_C=100,
+                 label="P = 100 Вт, m = 0.6 кг, A = 0.005 м², k = 10 Вт/м²·К"),
+            dict(P=150, m=0.3, A=0.01, k=10, T_min_C=90, T_max_C=110,
+                 label="P = 150 Вт, m = 0.6 кг, A = 0.01 м², k = 10 Вт/м²·К"),
+            dict(P=100, m=0.3, A=0.01, k=5, T_min_C=100, T_max_C=120,
+                 label="P = 100 Вт, m = 0.6 кг, A = 0.01 м², k = 5 Вт/м²·К"),
+        ],
+    ),
+    Tmin_Tmax=dict(
+        title="Влияние T_min и T_max на поведение нагревателя",
+        base=dict(P=100, m=0.3, A=0.01, k=10, thermostat_control='thermostat'),
+        points=[
+            dict(T_min_C=60, T_max_C=80, label="T_min=60°C, T_max=80°C"),
+            dict(T_min_C=100, T_max_C=110, label="T_min=100°C, T_max=110°C"),
+            dict(T_min_C=120, T_max_C=125, label="T_min=120°C, T_max=125°C"),
+            dict(T_min_C=150, T_max_C=170, label="T_min=150°C, T_max=170°C"),
+            dict(T_min_C=250, T_max_C=280, label="T_min=250°C, T_max=280"),
+        ],
+    ),
+    power=dict(
+        title="Влияние мощности на поведение нагревателя",
+        base=dict(m=0.3, A=0.01, k=10, T_min_C=70, T_max_C=100),
+        points=[
+            dict(P=50, label="P=50 Вт"),
+            dict(P=100, label="P=100 Вт"),
+            dict(P=150, label="P=150 Вт"),
+        ],
+    ),
+    k=dict(
+        title="Влияние коэффициента теплообмена на поведение нагревателя",
+        base=dict(P=100, m=0.3, A=0.01, T_min_C=70, T_max_C=100),
+        points=[
+            dict(k=5, label="k=5 Вт/м²·К"),
+            dict(k=10, label="k=10 Вт/м²·К"),
+            dict(k=20, label="k=20 Вт/м²·К"),
+        ],
+    ),
+    eta=dict(
+        title="Влияние  КПД на поведение нагревателя",
+        base=dict(P=300, m=0.3, A=0.01, k=10, T_min_C=70, T_max_C=100, time=50),
+        points=[
+            dict(eta='linear_min', label="η=0.2 + min(0.8, 0.8·(T-273)/40)"),
+            dict(eta='sin', label="η=0.2 + 0.8·sin((T-273)/60·π)"),
+        ],
+    ),
+)
+
+# --- Проведение экспериментов ---
+def draw_experiment_spec(ax, spec, **sweep_kwargs):
+    points = [{name: value for name, value in point.items() if name != 'label'} for point in spec['points']]
+    results = run_sweep(points, base=spec.get('base'), **sweep_kwargs)
+    for (t, T), point in zip(results, spec['points']):
+        plot_simulation(t, T, point['label'], ax=ax)
+    ax.set_title(spec['title'])
+
+def run_experiment_spec(spec, **sweep_kwargs):
+    fig, ax = plt.subplots(figsize=(12, 7))
+    draw_experiment_spec(ax, spec, **sweep_kwargs)
     plt.show()
 
+def add_plot_jobs(queue, output_dir):
+    # Все графики лабораторной для очереди common.rendering.RenderQueue;
+    # внутри процесса рендера пул не нужен, кеш серий общий
+    for name, spec in EXPERIMENTS.items():
+        queue.add(os.path.join(output_dir, f"experiment_{name}"), draw_experiment_spec, spec, workers=1)
+
+def run_experiments():
+    run_experiment_spec(EXPERIMENTS['params'])
+
 def run_Tmin_Tmax_experiments():
-    plt.figure(figsize=(12, 7))
-    base_params = dict(P=100, m=0.3, A=0.01, k=10)
-    t1, T1 = simulate_heater(**base_params, T_min_C=60, T_max_C=80 , thermostat_control=thermostat_control )
-    plot_simulation(t1, T1, "T_min=60°C, T_max=80°C")
-    
-    t2, T2 = simulate_heater(**base_params, T_min_C=100, T_max_C=110, thermostat_control=thermostat_control)
-    plot_simulation(t2, T2, "T_min=100°C, T_max=110°C")
-    t3, T3 = simulate_heater(**base_params, T_min_C=120, T_max_C=125,    thermostat_control=thermostat_control)
-    plot_simulation(t3, T3, "T_min=120°C, T_max=125°C")
-    t4, T4 = simulate_heater(**base_params, T_min_C=150, T_max_C=170, thermostat_control=thermostat_control)
-    plot_simulation(t4, T4, "T_min=150°C, T_max=170°C")
-    t5, T5 = simulate_heater(**base_params, T_min_C=250, T_max_C=280 , thermostat_control=thermostat_control)
-    plot_simulation(t5, T5, "T_min=250°C, T_max=280")
-    plt.title("Влияние T_min и T_max на поведение нагревателя")
-    plt.show()
+    run_experiment_spec(EXPERIMENTS['Tmin_Tmax'])
 
 def run_power_experiment():
-    plt.figure(figsize=(12, 7))
-    base_params = dict(m=0.3, S=0.01, k=10, T_min_C=70, T_max_C=100)
-    t1, T1 = simulate_heater(**base_params, P=50)
-    plot_simulation(t1, T1, "P=50 Вт")
-    t2, T2 = simulate_heater(**base_params, P=100)
-    plot_simulation(t2, T2, "P=100 Вт")
-    t3, T3 = simulate_heater(**base_params, P=150)
-    plot_simulation(t3, T3, "P=150 Вт")
-    plt.title("Влияние мощности на поведение нагревателя")
-    plt.show()
+    run_experiment_spec(EXPERIMENTS['power'])
 
 def run_k_experiment():
-    plt.figure(figsize=(12, 7))
-    base_params = dict(P=100, m=0.3, S=0.01, T_min_C=70, T_max_C=100)
-    t1, T1 = simulate_heater(**base_params, k=5)
-    plot_simulation(t1, T1, "k=5 Вт/м²·К")
-    t2, T2 = simulate_heater(**base_params, k=10)
-    plot_simulation(t2, T2, "k=10 Вт/м²·К")
-    t3, T3 = simulate_heater(**base_params, k=20)
-    plot_simulation(t3, T3, "k=20 Вт/м²·К")
-    plt.title("Влияние коэффициента теплообмена на поведение нагревателя")
-    plt.show()
+    run_experiment_spec(EXPERIMENTS['k'])
 
 def run_eta_experiment():
-    plt.figure(figsize=(12, 7))
-    base_params = dict(P=300, m=0.3, S=0.01, k=10, T_min_C=70, T_max_C=100 , time=50 )
-    t1, T1 = simulate_heater(**base_params, eta=lambda T: 0.2 +  min(0.8 , 0.8 * (T - T_k_0) / 40))
-    plot_simulation(t1, T1, "η=0.2 + min(0.8, 0.8·(T-273)/40)")
-    t2, T2 = simulate_heater(**base_params, eta=lambda T: 0.2 + 0.8 * np.sin((T-T_k_0) / 60 * np.pi))
-    plot_simulation(t2, T2, "η=0.2 + 0.8·sin((T-273)/60·π)")
-    # t3, T3 = simulate_heater(**base_params, eta=lambda T: 0.9 - 0.2 * np.exp(-(T-273)/200))
-    # plot_simulation(t3, T3, "η=0.9-0.2·exp(-(T-273)/200)")
-    plt.title("Влияние  КПД на поведение нагревателя")
-    plt.show()
+    run_experiment_spec(EXPERIMENTS['eta'])
 
 # --- Точка входа ---
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+
+# Точка входа (python lab2/benchmark.py): common/ берется из корня репозитория
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.benchmark import best_time
+from lab2 import PendulumModel, pendulum, simulate_pendulum
+
+# Параметры замера: вынужденный маятник из run_forced_oscillation_test
+params = dict(g=9.81, l=1.0, m=1.0, k=0.2, A=1.5, Omega=3.13)
+n_calls = 100000
+repeats = 5
+
+
+def evals_per_second(f, y, n_calls=n_calls):
+    def loop():
+        for i in range(n_calls):
+            f(0.01 * i, y)
+    return n_calls / best_time(loop, repeats)
+
+
+def run_benchmark():
+    g, l, m, k, A, Omega = params.values()
+    model = PendulumModel(**params)
+    lambda_rhs = lambda t, y: pendulum(t, y, g, l, m, k, A, Omega)
+
+    y = np.array([np.pi / 6, 0.0])
+    buffer = np.empty(2)
+    model_out = lambda t, y: model(t, y, out=buffer)
+
+    print("Вычислений правой части в секунду (одно состояние):")
+    print(f"  pendulum через лямбду:      {evals_per_second(lambda_rhs, y):12,.0f}")
+    print(f"  PendulumModel:              {evals_per_second(model, y):12,.0f}")
+    print(f"  PendulumModel, буфер out:   {evals_per_second(model_out, y):12,.0f}")
+
+    # Полный прогон RK4 из run_forced_oscillation_test
+    run = dict(k=k, A=A, Omega=Omega, theta0=np.pi / 6, t_span=(0, 50), n_steps=3000)
+    t_old = best_time(lambda: simulate_pendulum(**run, pendulum=pendulum), repeats)
+    t_new = best_time(lambda: simulate_pendulum(**run), repeats)
+    print("RK4, 3000 шагов:")
+    print(f"  pendulum через лямбду:      {t_old * 1e3:9.2f} мс")
+    print(f"  PendulumModel:              {t_new * 1e3:9.2f} мс ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
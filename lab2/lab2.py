@@ -1,7 +1,14 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import numpy as np
 from scipy.integrate import solve_ivp
+from scipy.sparse import block_diag
+from scipy.special import ellipk
 import matplotlib.pyplot as plt
 
+from common.ode import integrate, rk4_stepper
+
 import numpy as np
 
 
@@ -26,11 +33,146 @@ def pendulum(
     beta = k / (m * l**2)  # коэффициент трения
     gamma = g / l  # коэффициент гравитации
 
-    theta, omega = y
+    # y может быть как одним состоянием (2,), так и набором маятников (n, 2)
+    theta, omega = y[..., 0], y[..., 1]
     dtheta_dt = omega
     domega_dt = -beta * omega - gamma * np.sin(theta) + alpha * np.cos(Omega * t)
     
-    return [dtheta_dt, domega_dt]
+    return np.stack([dtheta_dt, domega_dt], axis=-1)
+
+
+# --- Модель маятника с предвычисленными коэффициентами ---
+class PendulumModel:
+    """Правая часть pendulum с коэффициентами, вычисленными один раз."""
+
+    def __init__(self, g=9.81, l=1.0, m=1.0, k=0.0, A=0.0, Omega=0.0):
+        # Параметры могут быть массивами формы (n,) для набора маятников
+        self.alpha = A / (m * l**2)  # коэффициент внешней силы
+        self.beta = k / (m * l**2)  # коэффициент трения
+        self.gamma = g / l  # коэффициент гравитации
+        self.Omega = Omega
+
+    def __call__(self, t, y, out=None):
+        # Производные пишутся в out (если передан), иначе в новый массив;
+        # out не должен совпадать с y
+        if out is None:
+            out = np.empty(np.shape(y))
+        theta, omega = y[..., 0], y[..., 1]
+        out[..., 0] = omega
+        out[..., 1] = -self.beta * omega - self.gamma * np.sin(theta) + self.alpha * np.cos(self.Omega * t)
+        return out
+
+    def jacobian(self, t, y):
+        # Аналитическая матрица Якоби: (2, 2) или (n, 2, 2) для набора
+        theta = np.asarray(y)[..., 0]
+        J = np.zeros(theta.shape + (2, 2))
+        J[..., 0, 1] = 1.0
+        J[..., 1, 0] = -self.gamma * np.cos(theta)
+        J[..., 1, 1] = -self.beta
+        return J
+
+
+# --- Метод Рунге-Кутты 4-го порядка ---
+def rk4(
+    f,          # правая часть f(t, y), y формы (2,) или (n, 2)
+    t_span,     # временной интервал (с)
+    y0,         # начальное состояние формы (2,) или (n, 2)
+    n_steps     # количество шагов
+):
+    # Шаг common.ode.rk4; история формы (n_steps + 1, 2) или (n_steps + 1, n, 2)
+    t0, t1 = t_span
+    t = np.linspace(t0, t1, n_steps + 1)
+    return t, integrate(f, y0, t, method='rk4', h=(t1 - t0) / n_steps)
+
+
+# --- Метод Дормана-Принса (адаптивный шаг, плотный вывод) ---
+def dopri5(
+    f,          # правая часть f(t, y)
+    t_span,     # временной интервал (с)
+    y0,         # начальное состояние формы (2,) или (n, 2)
+    n_steps,    # количество шагов выходной сетки
+    rtol=1e-8,  # относительная точность
+    atol=1e-10  # абсолютная точность
+):
+    # RK45 из common.ode: шаг выбирается по контролю ошибки, значения на
+    # сетке берутся из плотного вывода
+    t = np.linspace(t_span[0], t_span[1], n_steps + 1)
+    return t, integrate(f, y0, t, method='RK45', rtol=rtol, atol=atol)
+
+
+# --- Симплектический метод Верле (leapfrog) ---
+def verlet(
+    f,          # правая часть f(t, y); ускорение не должно зависеть от ω (k = 0)
+    t_span,     # временной интервал (с)
+    y0,         # начальное состояние формы (2,) или (n, 2)
+    n_steps     # количество шагов
+):
+    # Скоростной Верле: одно вычисление правой части на шаг,
+    # без векового дрейфа энергии для консервативного маятника
+    t0, t1 = t_span
+    h = (t1 - t0) / n_steps
+    t = np.linspace(t0, t1, n_steps + 1)
+
+    y = np.empty((n_steps + 1,) + np.shape(y0))
+    y[0] = y0
+    state = np.array(y0, dtype=float)
+    acc = f(t0, state)[..., 1]
+
+    for i in range(n_steps):
+        state[..., 1] += h / 2 * acc
+        state[..., 0] += h * state[..., 1]
+        acc = f(t0 + (i + 1) * h, state)[..., 1]
+        state[..., 1] += h / 2 * acc
+        y[i + 1] = state
+
+    return t, y
+
+
+# --- Неявный метод Радо (для жестких задач) ---
+def radau(
+    f,          # правая часть f(t, y); если есть f.jacobian, он используется
+    t_span,     # временной интервал (с)
+    y0,         # начальное состояние формы (2,) или (n, 2)
+    n_steps,    # количество шагов выходной сетки
+    rtol=1e-8,  # относительная точность
+    atol=1e-10  # абсолютная точность
+):
+    shape = np.shape(y0)
+    t = np.linspace(t_span[0], t_span[1], n_steps + 1)
+
+    def ode(t, y):
+        return np.ravel(f(t, y.reshape(shape)))
+
+    jac = None
+    if hasattr(f, 'jacobian'):
+        def jac(t, y):
+            J = f.jacobian(t, y.reshape(shape))
+            # Для набора маятников матрица блочно-диагональная
+            return J if J.ndim == 2 else block_diag(list(J), format='csc')
+
+    sol = solve_ivp(ode, t_span, np.ravel(y0), method='Radau', t_eval=t, jac=jac, rtol=rtol, atol=atol)
+    return t, sol.y.T.reshape((n_steps + 1,) + shape)
+
+
+# --- Модель для общего каркаса common.ode ---
+# pendulum уже следует протоколу rhs(t, y, **params) с y формы (..., 2)
+MODELS = {
+    'pendulum': dict(
+        rhs=pendulum,
+        dim=2,
+        params=dict(g=9.81, l=1.0, m=1.0, k=0.0, A=0.0, Omega=0.0),
+        y0=[np.pi / 6, 0.0],
+    ),
+}
+
+
+# --- Реестр решателей ---
+SOLVERS = {
+    'rk4': rk4,
+    'dopri5': dopri5,
+    'verlet': verlet,
+    'radau': radau,
+}
 
 
 # --- Симуляция движения маятника ---
@@ -41,108 +183,374 @@ def simulate_pendulum(
     k = 1,        # коэффициент трения
     A = 0.0,      # амплитуда внешней силы
     Omega = 0,    # частота внешней силы
-    pendulum=pendulum,  # функция системы уравнений
+    pendulum=None,  # функция системы уравнений (None — PendulumModel)
     theta0 = np.pi / 4,  # начальный угол (рад)
     omega0 = 0.0,  # начальная угловая скорость (рад/с)
     t_span=(0, 10),  # временной интервал (с)
-    n_steps=1000  # количество шагов
+    n_steps=1000,  # количество шагов
+    method='rk4',  # решатель из SOLVERS: 'rk4', 'dopri5', 'verlet', 'radau'
+    **solver_options  # параметры решателя (например, rtol и atol для 'dopri5')
 ):
     
-    y0 = [theta0, omega0]
+    # Любой из параметров может быть массивом — тогда моделируется набор
+    # маятников, и решение имеет форму (n_steps + 1, n, 2)
+    g, l, m, k, A, Omega, theta0, omega0 = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (g, l, m, k, A, Omega, theta0, omega0))
+    )
+    y0 = np.stack([theta0, omega0], axis=-1)
+
+    if method not in SOLVERS:
+        raise ValueError(f"Неизвестный решатель '{method}', доступны: {', '.join(SOLVERS)}")
+    if method == 'verlet' and np.any(k != 0):
+        raise ValueError("Метод Верле применим только без трения (k = 0)")
+    
+    if pendulum is None:
+        f = PendulumModel(g, l, m, k, A, Omega)
+    else:
+        f = lambda t , y : pendulum(t ,y , g , l , m , k , A, Omega)
     
-    return rk4(lambda t , y : pendulum(t ,y , g , l , m , k , A, Omega), t_span, y0, n_steps)
+    return SOLVERS[method](f, t_span, y0, n_steps, **solver_options)
 
 
-    y0 = [theta0, omega0]
-    t_eval = np.linspace(t_span[0], t_span[1], n_steps + 1)
-    def ode(t, y):
-        return pendulum(t, y, g, l, m, k, A, Omega)
-    
-    sol = solve_ivp(ode, t_span, y0, t_eval=t_eval)
-    return sol.t, sol.y.T
+# --- Сечение Пуанкаре вынужденного маятника ---
+N_SAMPLE = 100  # точек сечения по умолчанию (poincare_section, bifurcation_diagram)
+
+def poincare_section(
+    A,                  # амплитуда внешней силы (скаляр или массив)
+    Omega,              # частота внешней силы (скаляр или массив)
+    k=0.5,              # коэффициент трения
+    g=9.81,             # ускорение свободного падения (м/с^2)
+    l=1.0,              # длина маятника (м)
+    m=1.0,              # масса маятника (кг)
+    theta0=0.2,         # начальный угол (рад)
+    omega0=0.0,         # начальная угловая скорость (рад/с)
+    n_transient=300,    # число отбрасываемых периодов (переходный процесс)
+    n_sample=N_SAMPLE,  # число сохраняемых точек сечения
+    steps_per_period=100, # шагов RK4 на период внешней силы
+    pendulum=None,      # функция системы уравнений (None — PendulumModel)
+):
+    # Все маятники интегрируются одним пакетом (n, 2); у каждого свой шаг
+    # h = 2π / (Omega * steps_per_period), поэтому конец каждого блока шагов
+    # попадает ровно на период внешней силы. Хранится только сечение.
+    g, l, m, k, A, Omega, theta0, omega0 = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (g, l, m, k, A, Omega, theta0, omega0))
+    )
+    y = np.stack([theta0, omega0], axis=-1)
+    y_next = np.empty_like(y)
+    h = 2 * np.pi / (Omega * steps_per_period)
+    section = np.empty((y.shape[0], n_sample, 2))
 
+    if pendulum is None:
+        f = PendulumModel(g, l, m, k, A, Omega)
+    else:
+        def f(t, y):
+            return pendulum(t, y, g, l, m, k, A, Omega)
+    step = rk4_stepper(f, y)
 
-# --- Визуализация ---
-def plot_simulation(t, T, label):
-    plt.plot(t, T, label=label)
-    plt.xlabel('Время (с)')
-    plt.ylabel('Угол θ (рад)')
+    for period in range(n_transient + n_sample):
+        for j in range(steps_per_period):
+            # Время считается от начала периода: фаза cos(Omega * t) та же
+            step(j * h, y, h, y_next)
+            y, y_next = y_next, y
+        # Угол приводим к [-π, π), чтобы проворот не уводил точки сечения
+        y[:, 0] = (y[:, 0] + np.pi) % (2 * np.pi) - np.pi
+        if period >= n_transient:
+            section[:, period - n_transient] = y
+
+    return section  # (n, n_sample, 2)
+
+
+def _poincare_chunk(start, A, Omega, options):
+    return start, poincare_section(A, Omega, **options)
+
+
+# --- Бифуркационная диаграмма ---
+BIFURCATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bifurcation')
+
+def bifurcation_diagram(
+    A_values,           # значения амплитуды внешней силы
+    Omega_values,       # значения частоты внешней силы
+    output_dir,         # папка для результатов
+    workers=None,       # число процессов (None — по числу ядер)
+    chunk_size=64,      # число маятников в одной задаче
+    n_sample=N_SAMPLE,  # число точек сечения на маятник
+    **options           # остальные параметры poincare_section
+):
+    # Сканирует сетку (A, Omega) параллельно по ядрам. На диск пишутся
+    # только точки сечения: params.npy — (n, 2) пары (A, Omega),
+    # section.npy — (n, n_sample, 2), заполняется по мере готовности задач.
+    os.makedirs(output_dir, exist_ok=True)
+    A_grid, Omega_grid = np.meshgrid(np.asarray(A_values, dtype=float), np.asarray(Omega_values, dtype=float), indexing='ij')
+    params = np.stack([A_grid.ravel(), Omega_grid.ravel()], axis=-1)
+    np.save(os.path.join(output_dir, 'params.npy'), params)
+
+    # n_sample передается в poincare_section явно: форма файла и то, что
+    # пишут процессы, задаются одним значением
+    options = dict(options, n_sample=n_sample)
+    section_path = os.path.join(output_dir, 'section.npy')
+    section = np.lib.format.open_memmap(section_path, mode='w+', dtype=float, shape=(len(params), n_sample, 2))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_poincare_chunk, start, params[start:start + chunk_size, 0], params[start:start + chunk_size, 1], options)
+            for start in range(0, len(params), chunk_size)
+        ]
+        for future in as_completed(futures):
+            start, chunk = future.result()
+            section[start:start + len(chunk)] = chunk
+            section.flush()
+
+    del section
+    return section_path
+
+
+def plot_bifurcation(output_dir, axis=0, label='Амплитуда внешней силы A'):
+    # axis=0 — по A, axis=1 — по Omega
+    params = np.load(os.path.join(output_dir, 'params.npy'))
+    section = np.load(os.path.join(output_dir, 'section.npy'), mmap_mode='r')
+    n_sample = section.shape[1]
+    plt.figure(figsize=(12, 8))
+    plt.plot(np.repeat(params[:, axis], n_sample), section[:, :, 0].ravel(), ',k', alpha=0.5)
+    plt.xlabel(label)
+    plt.ylabel('Угол θ в сечении Пуанкаре (рад)')
     plt.grid(True)
-    plt.legend(loc='lower right')
+
+
+# --- Точный период (эллиптический интеграл) ---
+def exact_period(
+    theta0,     # амплитуда (рад), скаляр или массив
+    l=1.0,      # длина маятника (м)
+    g=9.81,     # ускорение свободного падения (м/с^2)
+):
+    # T = 4 sqrt(l/g) K(sin²(θ0/2)) — период свободного маятника без трения
+    # при любой амплитуде |θ0| < π; эталон для проверки решателей
+    return 4 * np.sqrt(l / g) * ellipk(np.sin(np.asarray(theta0) / 2) ** 2)
+
+
+# --- Измерение периода, затухания и амплитуды ---
+def measure_oscillations(
+    t,          # равномерная сетка времени (n_t,)
+    theta,      # угол (n_t,) или набор траекторий (n_t, n), например y[..., 0]
+    tail=0.2,   # доля конца записи для установившейся амплитуды
+):
+    # Все величины считаются сразу для всех траекторий, без циклов по ним.
+    # Возвращает словарь массивов формы (n,) (или скаляров для одной траектории).
+    t = np.asarray(t, dtype=float)
+    theta = np.asarray(theta, dtype=float)
+    single = theta.ndim == 1
+    if single:
+        theta = theta[:, None]
+    h = t[1] - t[0]
+    tt = t[:, None]
+
+    # Период: восходящие нули θ с линейной интерполяцией момента пересечения
+    th0, th1 = theta[:-1], theta[1:]
+    up = (th0 < 0) & (th1 >= 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_cross = tt[:-1] - th0 * h / (th1 - th0)
+    n_crossings = up.sum(axis=0)
+    first = np.where(up, t_cross, np.inf).min(axis=0)
+    last = np.where(up, t_cross, -np.inf).max(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        period = np.where(n_crossings >= 2, (last - first) / (n_crossings - 1), np.nan)
+
+    # Затухание: положительные максимумы с параболической интерполяцией,
+    # наклон прямой ln(пик) от времени по методу наименьших квадратов
+    y0, y1, y2 = theta[:-2], theta[1:-1], theta[2:]
+    peaks = (y1 > y0) & (y1 >= y2) & (y1 > 0)
+    curvature = y0 - 2 * y1 + y2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        offset = np.where(peaks, (y0 - y2) / (2 * curvature), 0.0)
+        peak_value = np.where(peaks, y1 - (y0 - y2) ** 2 / (8 * curvature), 1.0)
+        log_peak = np.log(np.where(peaks, peak_value, 1.0))
+    t_peak = tt[1:-1] + offset * h
+    w = peaks.astype(float)
+    sw = w.sum(axis=0)
+    sx = (w * t_peak).sum(axis=0)
+    sy = (w * log_peak).sum(axis=0)
+    sxx = (w * t_peak ** 2).sum(axis=0)
+    sxy = (w * t_peak * log_peak).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decay_rate = np.where(sw >= 2, -(sw * sxy - sx * sy) / (sw * sxx - sx ** 2), np.nan)
+
+    # Установившаяся амплитуда: размах на последней доле записи
+    tail_part = theta[int(len(t) * (1 - tail)):]
+    amplitude = (tail_part.max(axis=0) - tail_part.min(axis=0)) / 2
+
+    result = dict(
+        period=period,
+        decay_rate=decay_rate,
+        amplitude=amplitude,
+        n_crossings=n_crossings,
+    )
+    if single:
+        result = {name: value[0] for name, value in result.items()}
+    return result
+
+
+# --- Период по сетке начальных углов ---
+def sweep_period(
+    theta0,             # массив начальных углов (рад)
+    l=1.0,              # длина маятника (м)
+    t_span=(0, 20),     # временной интервал (с)
+    n_steps=2000,       # количество шагов RK4
+    chunk_size=2000,    # маятников в одном пакете (ограничивает память)
+    k=0,                # коэффициент трения
+    **params            # остальные параметры simulate_pendulum
+):
+    theta0 = np.asarray(theta0, dtype=float)
+    period = np.empty_like(theta0)
+    for start in range(0, len(theta0), chunk_size):
+        chunk = theta0[start:start + chunk_size]
+        t, y = simulate_pendulum(l=l, k=k, theta0=chunk, t_span=t_span, n_steps=n_steps, **params)
+        period[start:start + chunk_size] = measure_oscillations(t, y[..., 0])['period']
+    return period
+
+
+# --- Визуализация ---
+def plot_simulation(t, T, label, ax=None):
+    ax = ax or plt.gca()
+    ax.plot(t, T, label=label)
+    ax.set_xlabel('Время (с)')
+    ax.set_ylabel('Угол θ (рад)')
+    ax.grid(True)
+    ax.legend(loc='lower right')
+
+
+FREE_PENDULUM_CASES = [
+    (2.4525, 'Поведение маятника с дилиной 2.4525 м'),
+    (9.81, 'Поведение маятника с дилиной 9.81 м'),
+    (39.24, 'Поведение маятника с дилиной 39.24 м'),
+]
+
+FRICTION_CASES = [
+    (0.1, 'Коэффициент трения 0.1'),
+    (1, 'Коэффициент трения 1'),
+    (5, 'Коэффициент трения 5'),
+]
+
+FORCED_COMMON_PARAMS = dict(
+    theta0=np.pi / 6,    # Умеренный начальный угол
+    omega0=0.0,          # Без начальной скорости
+    Omega=3.13,          # Частота внешней силы, около резонансной (sqrt(g/l) ≈ 3.13)
+    t_span=(0, 50),      
+    n_steps=3000
+)
+
+FORCED_SCENARIOS = [
+    {"k": 0.2, "A": 0.0, "label": "Свободные колебания с трением (k=0.2, A=0)"},
+    {"k": 0.2, "A": 0.3, "label": "Слабая внешняя сила (A=0.3 < k=0.2)"},
+    {"k": 0.2, "A": 0.7, "label": "Внешняя сила сравнима с трением (A≈k)"},
+    {"k": 0.2, "A": 1.5, "label": "Сильная внешняя сила (A=1.5 > k)"},
+    {"k": 0.05, "A": 1.5, "label": "Малое трение, сильная сила (практически резонанс)"},
+    {"k": 0.5, "A": 1.5, "label": "Большое трение, та же сила (A=1.5, k=0.5)"},
+]
+
+
+def plot_free_pendulum(ax, t, theta, label):
+    plot_simulation(t, theta, label, ax=ax)
+    pi_ticks = np.arange(0, np.pi * 6, np.pi)
+    for x in pi_ticks:
+        ax.axvline(x=x, color='gray', linestyle='--')
+
+
+def draw_free_pendulum(ax, L, label):
+    t, T = simulate_pendulum(l=L, theta0=np.pi / 18, t_span=(0, np.pi * 6), n_steps=10000 , k = 0)
+    plot_free_pendulum(ax, t, T[:, 0], label)
+
+
+def draw_friction(ax):
+    k_s = [k for k, _ in FRICTION_CASES]
+    t, T = simulate_pendulum(l=1, theta0=np.pi / 18, t_span=(0, np.pi * 6), n_steps=10000, k=k_s)
+    for i, (k, label) in enumerate(FRICTION_CASES):
+        plot_simulation(t, T[:, i, 0], label, ax=ax)
+
+
+def draw_forced_oscillation(ax):
+    t, T = simulate_pendulum(
+        **FORCED_COMMON_PARAMS,
+        k=[scenario["k"] for scenario in FORCED_SCENARIOS],
+        A=[scenario["A"] for scenario in FORCED_SCENARIOS]
+    )
+    for i, scenario in enumerate(FORCED_SCENARIOS):
+        ax.plot(t, T[:, i, 0], label=scenario["label"])
+
+    ax.set_xlabel('Время (с)')
+    ax.set_ylabel('Угол θ (рад)')
+    ax.set_title("Вынужденные колебания с трением: сравнительный анализ")
+    ax.grid(True)
+    ax.legend(loc='upper right')
+
+
+def draw_period_sweep(axes, n_angles=20000):
+    # Период свободного маятника от начального угла: RK4 против точной формулы
+    ax1, ax2 = axes
+    theta0 = np.linspace(0.01, 3.0, n_angles)
+    measured = sweep_period(theta0, l=1)
+    exact = exact_period(theta0, l=1)
+
+    ax1.plot(theta0, exact, 'k-', label='Точный период (эллиптический интеграл)')
+    ax1.plot(theta0, measured, 'r--', label='RK4, нули θ')
+    ax1.set_ylabel('Период (с)')
+    ax1.grid(True)
+    ax1.legend(loc='upper left')
+    ax2.semilogy(theta0, np.abs(measured - exact) / exact)
+    ax2.set_xlabel('Начальный угол θ0 (рад)')
+    ax2.set_ylabel('Относительная ошибка')
+    ax2.grid(True)
 
 
 def run_free_pendulum_perion_test():
-    Ls = [2.4525 , 9.81 , 39.24]
-    labels = ['Поведение маятника с дилиной 2.4525 м',
-              'Поведение маятника с дилиной 9.81 м',
-              'Поведение маятника с дилиной 39.24 м']
-    for i, L in enumerate(Ls):
-
-        t, T = simulate_pendulum(l=L, theta0=np.pi / 18, t_span=(0, np.pi * 6), n_steps=10000 , k = 0)
-        plt.plot(t, T[ : , 0], label=labels[i])
-        plt.xlabel('Время (с)')
-        plt.ylabel('Угол θ (рад)')
-        plt.grid(True)
-        plt.legend(loc='lower right')
-  
-
-        pi_ticks = np.arange(0, np.pi * 6, np.pi)
-        for x in pi_ticks:
-            plt.axvline(x=x, color='gray', linestyle='--')
+    # Все длины считаются одним пакетом: T имеет форму (n_steps + 1, 3, 2)
+    Ls = [L for L, _ in FREE_PENDULUM_CASES]
+    t, T = simulate_pendulum(l=Ls, theta0=np.pi / 18, t_span=(0, np.pi * 6), n_steps=10000 , k = 0)
+    for i, (L, label) in enumerate(FREE_PENDULUM_CASES):
+        fig, ax = plt.subplots()
+        plot_free_pendulum(ax, t, T[:, i, 0], label)
         plt.show()
 
 def run_friction_test():
-    k_s = [ 0.1, 1, 5]
-
-    labels = ['Коэффициент трения 0.1',
-              'Коэффициент трения 1',
-              'Коэффициент трения 5']
-    for i, k in enumerate(k_s):
-        t, T = simulate_pendulum(l=1, theta0=np.pi / 18, t_span=(0, np.pi * 6), n_steps=10000, k=k)
-        plt.plot(t, T[:, 0], label=labels[i])
-        plt.xlabel('Время (с)')
-        plt.ylabel('Угол θ (рад)')
-        plt.grid(True)
-        plt.legend(loc='lower right')
-
+    fig, ax = plt.subplots()
+    draw_friction(ax)
     plt.show()
 
 def run_forced_oscillation_test():
-    plt.figure(figsize=(12, 8))
+    fig, ax = plt.subplots(figsize=(12, 8))
+    draw_forced_oscillation(ax)
+    plt.tight_layout()
+    plt.show()
 
-    common_params = dict(
-        theta0=np.pi / 6,    # Умеренный начальный угол
-        omega0=0.0,          # Без начальной скорости
-        Omega=3.13,          # Частота внешней силы, около резонансной (sqrt(g/l) ≈ 3.13)
-        t_span=(0, 50),      
-        n_steps=3000
+def run_bifurcation_test():
+    # Классический сценарий перехода к хаосу: β = ω0 / 2, Omega = 2/3 ω0,
+    # амплитуда от 1.0 до 1.5 в единицах g / l
+    omega_0 = np.sqrt(9.81)
+    bifurcation_diagram(
+        A_values=np.linspace(1.0, 1.5, 400) * 9.81,
+        Omega_values=[2 / 3 * omega_0],
+        output_dir=BIFURCATION_DIR,
+        k=omega_0 / 2,
     )
+    plot_bifurcation(BIFURCATION_DIR)
+    plt.title('Бифуркационная диаграмма вынужденного маятника')
+    plt.show()
 
-    scenarios = [
-        {"k": 0.2, "A": 0.0, "label": "Свободные колебания с трением (k=0.2, A=0)"},
-        {"k": 0.2, "A": 0.3, "label": "Слабая внешняя сила (A=0.3 < k=0.2)"},
-        {"k": 0.2, "A": 0.7, "label": "Внешняя сила сравнима с трением (A≈k)"},
-        {"k": 0.2, "A": 1.5, "label": "Сильная внешняя сила (A=1.5 > k)"},
-        {"k": 0.05, "A": 1.5, "label": "Малое трение, сильная сила (практически резонанс)"},
-        {"k": 0.5, "A": 1.5, "label": "Большое трение, та же сила (A=1.5, k=0.5)"},
-    ]
-
-    for scenario in scenarios:
-        t, T = simulate_pendulum(
-            **common_params,
-            k=scenario["k"],
-            A=scenario["A"]
-        )
-        plt.plot(t, T[:, 0], label=scenario["label"])
-
-    plt.xlabel('Время (с)')
-    plt.ylabel('Угол θ (рад)')
-    plt.title("Вынужденные колебания с трением: сравнительный анализ")
-    plt.grid(True)
-    plt.legend(loc='upper right')
+def run_period_sweep_test():
+    fig, axes = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+    draw_period_sweep(axes)
     plt.tight_layout()
     plt.show()
+
+
+def add_plot_jobs(queue, output_dir):
+    # Все графики лабораторной для очереди common.rendering.RenderQueue
+    for i, (L, label) in enumerate(FREE_PENDULUM_CASES):
+        queue.add(os.path.join(output_dir, f"free_pendulum_{i + 1}"), draw_free_pendulum, L, label, figsize=(6.4, 4.8))
+    queue.add(os.path.join(output_dir, "friction"), draw_friction, figsize=(6.4, 4.8))
+    queue.add(os.path.join(output_dir, "forced_oscillation"), draw_forced_oscillation, figsize=(12, 8))
+    queue.add(os.path.join(output_dir, "period_sweep"), draw_period_sweep, figsize=(12, 8), nrows=2)
+
+# Запуск из корня репозитория: python -m lab2.lab2
 if __name__ == "__main__":
     # run_free_pendulum_perion_test()
     # run_friction_test()
-    run_forced_oscillation_test()
\ No newline at end of file
+    run_forced_oscillation_test()
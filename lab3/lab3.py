@@ -1,7 +1,12 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import solve_ivp
 
+from common.ode import rk4_stepper
+
 # Параметры модели
 a = 1.1  # рождаемость жертв
 b = 0.4  # интенсивность охоты
@@ -14,6 +19,37 @@ def lotka_volterra(t, z):
     dydt = c * x * y - d * y
     return [dxdt, dydt]
 
+# Векторная правая часть: z формы (2, N) или (2, N, k), параметры — скаляры
+# или массивы (N,), по одному набору на траекторию
+def lotka_volterra_batch(t, z, a=a, b=b, c=c, d=d):
+    x, y = z[0], z[1]
+    out = np.empty_like(z)
+    out[0] = a * x - b * x * y
+    out[1] = c * x * y - d * y
+    return out
+
+# Правая часть для общего каркаса common.ode: состояние по последней оси,
+# z формы (..., 2)
+def lotka_volterra_rhs(t, z, a=a, b=b, c=c, d=d):
+    return np.moveaxis(lotka_volterra_batch(t, np.moveaxis(z, -1, 0), a, b, c, d), 0, -1)
+
+MODELS = {
+    'lotka_volterra': dict(
+        rhs=lotka_volterra_rhs,
+        dim=2,
+        params=dict(a=a, b=b, c=c, d=d),
+        y0=[40.0, 9.0],
+    ),
+}
+
+# Первый интеграл системы: V = c·x − d·ln x + b·y − a·ln y
+def invariant(x, y, a=a, b=b, c=c, d=d):
+    return c * x - d * np.log(x) + b * y - a * np.log(y)
+
+# Коэффициенты композиции Йошиды (4-й порядок из шагов Стрэнга)
+_yoshida_w1 = 1 / (2 - 2 ** (1 / 3))
+_yoshida_w0 = -2 ** (1 / 3) / (2 - 2 ** (1 / 3))
+
 # Начальные условия для трёх экспериментов
 initial_conditions = [
     (40, 9),
@@ -24,40 +60,369 @@ initial_conditions = [
 t_span = (0, 128)  # интервал времени моделирования
 t_eval = np.linspace(*t_span, 1000)  # точки для вывода решения
 
-for i, (x0, y0) in enumerate(initial_conditions):
-    sol = solve_ivp(lotka_volterra, t_span, [x0, y0], t_eval=t_eval, method='RK45')
+# --- Ансамбль траекторий ---
+def solve_ensemble(
+    x0,             # начальные численности жертв, (N,)
+    y0,             # начальные численности хищников, (N,)
+    t_eval=t_eval,  # точки вывода решения
+    a=a, b=b, c=c, d=d, # параметры модели: скаляры или массивы (N,)
+    method='rk4',   # 'rk4' — пакетный RK4, 'splitting' — симплектический
+                    # метод расщепления в логарифмах, иначе метод solve_ivp
+    substeps=10,    # шагов между соседними точками t_eval
+    order=2,        # порядок метода расщепления: 2 (Стрэнг) или 4 (Йошида)
+    rtol=1e-6,      # относительная точность (solve_ivp)
+    atol=1e-9,      # абсолютная точность (solve_ivp)
+):
+    # Все N траекторий интегрируются вместе; результат формы (N, 2, len(t_eval))
+    x0, y0, a, b, c, d = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (x0, y0, a, b, c, d))
+    )
+    t_eval = np.asarray(t_eval, dtype=float)
+    n = x0.size
 
-    x = sol.y[0]
-    y = sol.y[1]
-    t = sol.t
+    if method == 'splitting':
+        # В переменных p = ln x, q = ln y система гамильтонова с H = V:
+        # dp/dt = a − b·e^q, dq/dt = c·e^p − d. Каждая половина точно
+        # интегрируется сдвигом, композиция симплектическая, поэтому V не
+        # дрейфует даже при крупном шаге, а численности всегда положительны
+        if order not in (2, 4):
+            raise ValueError("Порядок метода расщепления должен быть 2 или 4")
+        weights = (1.0,) if order == 2 else (_yoshida_w1, _yoshida_w0, _yoshida_w1)
+        result = np.empty((n, 2, len(t_eval)))
+        result[:, 0, 0] = x0
+        result[:, 1, 0] = y0
+        p, q = np.log(x0), np.log(y0)
+        for j in range(len(t_eval) - 1):
+            h = (t_eval[j + 1] - t_eval[j]) / substeps
+            for _ in range(substeps):
+                for w in weights:
+                    p = p + w * h / 2 * (a - b * np.exp(q))
+                    q = q + w * h * (c * np.exp(p) - d)
+                    p = p + w * h / 2 * (a - b * np.exp(q))
+            result[:, 0, j + 1] = np.exp(p)
+            result[:, 1, j + 1] = np.exp(q)
+        return result
 
-    plt.figure(figsize=(12, 7))
+    if method != 'rk4':
+        # Один вызов solve_ivp на весь ансамбль: состояние (2N,),
+        # правая часть векторизована и по столбцам (vectorized=True),
+        # поэтому z приходит формы (2N, k)
+        params = [p[:, None] for p in (a, b, c, d)]
+
+        def ode(t, z):
+            return lotka_volterra_batch(t, z.reshape(2, n, -1), *params).reshape(z.shape)
+
+        sol = solve_ivp(
+            ode, (t_eval[0], t_eval[-1]), np.concatenate([x0, y0]), t_eval=t_eval,
+            method=method, vectorized=True, rtol=rtol, atol=atol,
+        )
+        return sol.y.reshape(2, n, -1).transpose(1, 0, 2)
+
+    # Шаг RK4 из common.ode; при общем шаге h раскладка состояния любая,
+    # и z остается (2, N): компоненты x и y — непрерывные строки
+    result = np.empty((n, 2, len(t_eval)))
+    z = np.stack([x0, y0])
+    z_next = np.empty_like(z)
+    result[:, :, 0] = z.T
+    step = rk4_stepper(lotka_volterra_batch, z, dict(a=a, b=b, c=c, d=d))
+
+    for j in range(len(t_eval) - 1):
+        t = t_eval[j]
+        h = (t_eval[j + 1] - t_eval[j]) / substeps
+        for _ in range(substeps):
+            step(t, z, h, z_next)
+            z, z_next = z_next, z
+            t += h
+        result[:, :, j + 1] = z.T
+
+    return result
+
+# --- Контроль первого интеграла ---
+def invariant_drift(solutions, a=a, b=b, c=c, d=d):
+    # Абсолютная ошибка V вдоль каждой траектории ансамбля (N, n_t)
+    # относительно начального значения; NaN — численность ушла в x ≤ 0 или y ≤ 0
+    a, b, c, d = (np.reshape(p, (-1, 1)) if np.ndim(p) else p for p in (a, b, c, d))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        V = invariant(solutions[:, 0], solutions[:, 1], a, b, c, d)
+    return np.abs(V - V[:, :1])
+
+# --- Экстремумы, период и площадь орбиты (квадратура по первому интегралу) ---
+def _phi(z):
+    # e^z − 1 − z без потери точности при малых z (ряд Тейлора до z^6)
+    small = z * z / 2 * (1 + z / 3 * (1 + z / 4 * (1 + z / 5 * (1 + z / 6))))
+    return np.where(np.abs(z) < 1e-2, small, np.expm1(z) - z)
+
+def _phi_inverse(sigma, n_iter=5):
+    # Корень z уравнения e^z − 1 − z = sigma²/2 со знаком sigma: начальное
+    # приближение — ряд при |sigma| < 1 и асимптотики при больших |sigma|,
+    # затем несколько шагов Ньютона
+    t = sigma * sigma / 2
+    z = np.where(
+        np.abs(sigma) < 1,
+        sigma * (1 - sigma / 3 * (1 - sigma / 12)),
+        np.where(sigma > 0, np.log1p(t + np.log1p(t)), -1 - t + np.exp(-1 - t)),
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(n_iter):
+            z = np.where(z != 0, z - (_phi(z) - t) / np.expm1(z), z)
+    return z
+
+def orbit_excess(x0, y0, a=a, b=b, c=c, d=d):
+    # E = V − V_min = d·φ(r0) + a·φ(s0), r0 = ln(c·x0/d), s0 = ln(b·y0/a);
+    # через φ без вычитания близких V, поэтому точно и у самого равновесия
+    r0 = np.log(np.asarray(x0, dtype=float) * c / d)
+    s0 = np.log(np.asarray(y0, dtype=float) * b / a)
+    return d * _phi(r0) + a * _phi(s0)
+
+def orbit_extrema(x0, y0, a=a, b=b, c=c, d=d):
+    # Экстремумы x лежат на прямой y = a/b (s = 0), т.е. d·φ(r) = E и
+    # r± = φ⁻¹(±sqrt(2E/d)); экстремумы y — на x = d/c (r = 0), a·φ(s) = E.
+    # Возвращает x_min, x_max, y_min, y_max
+    E = orbit_excess(x0, y0, a, b, c, d)
+    sigma_r = np.sqrt(2 * E / d)
+    sigma_s = np.sqrt(2 * E / a)
+    x_min, x_max = (d / c * np.exp(_phi_inverse(sign * sigma_r)) for sign in (-1, 1))
+    y_min, y_max = (a / b * np.exp(_phi_inverse(sign * sigma_s)) for sign in (-1, 1))
+    return x_min, x_max, y_min, y_max
+
+def orbit_period_quadrature(x0, y0, a=a, b=b, c=c, d=d, n_nodes=128):
+    # Период и площадь |∮ x dy| без интегрирования ОДУ, сразу для массива
+    # начальных условий. В r = ln(c·x/d), s = ln(b·y/a) первый интеграл
+    # V − V_min = d·φ(r) + a·φ(s), φ(z) = e^z − 1 − z. Замена
+    # σ = sign(z)·sqrt(2φ(z)) превращает орбиту в эллипс d·σ_r² + a·σ_s² = 2E,
+    # σ_r = sqrt(2E/d)·cos θ, σ_s = sqrt(2E/a)·sin θ, и
+    #   dt/dθ = h(r)·h(s) / sqrt(a·d),  h(z) = σ(z) / (e^z − 1).
+    # Подынтегральная функция гладкая и 2π-периодическая по θ, поэтому
+    # формула трапеций с n_nodes узлами сходится экспоненциально (128 узлов —
+    # ~1e-12 даже для орбит с x_min ~ 1e-42); у точки равновесия период
+    # стремится к 2π/sqrt(a·d) без особенности.
+    E = orbit_excess(x0, y0, a, b, c, d)
+    theta = 2 * np.pi * np.arange(n_nodes) / n_nodes
+    sigma_r = np.sqrt(2 * E / d)[..., None] * np.cos(theta)
+    sigma_s = np.sqrt(2 * E / a)[..., None] * np.sin(theta)
+    r, s = _phi_inverse(sigma_r), _phi_inverse(sigma_s)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h_r = np.where(r != 0, sigma_r / np.expm1(r), 1.0)
+        h_s = np.where(s != 0, sigma_s / np.expm1(s), 1.0)
+    step = 2 * np.pi / n_nodes
+    period = step / np.sqrt(a * d) * np.sum(h_r * h_s, axis=-1)
+    # x·dy = (d/c)·(a/b)·e^{r+s}·ds, ds/dθ = sqrt(d/a)·σ_r·h(s)
+    area = d / c * a / b * np.sqrt(d / a) * step * np.abs(np.sum(np.exp(r + s) * sigma_r * h_s, axis=-1))
+    return period, area
+
+# --- Период и площадь орбиты (события на ОДУ) ---
+def orbit_period(x0, y0, a=a, b=b, c=c, d=d, rtol=1e-8, atol=1e-10):
+    # Интегрирование в p = ln x, q = ln y без плотного вывода. Событие —
+    # dx/dt = 0, т.е. q = ln(a/b). Сначала доходим до точки x_max (q растет),
+    # затем через x_min (q убывает) обратно к x_max: это ровно один период.
+    # Третья компонента состояния — площадь ∮ x dy = ∫ x·y·(c·x − d) dt.
+    q_star = np.log(a / b)
+
+    def rhs(t, s):
+        p, q, _ = s
+        x, y = np.exp(p), np.exp(q)
+        return [a - b * y, c * x - d, x * y * (c * x - d)]
+
+    def upward(t, s):
+        return s[1] - q_star
+    upward.terminal = True
+    upward.direction = 1
+
+    def downward(t, s):
+        return s[1] - q_star
+    downward.terminal = True
+    downward.direction = -1
+
+    state = [np.log(x0), np.log(y0), 0.0]
+    t0 = 0.0
+    t_max = 1e4  # защита от вырожденных орбит
+    times = []
+    for event in (upward, downward, upward):
+        # Пробные слишком длинные шаги дают переполнение exp — такие шаги
+        # решатель сам отбрасывает, предупреждения не нужны
+        with np.errstate(over='ignore', invalid='ignore'):
+            sol = solve_ivp(rhs, (t0, t_max), state, method='DOP853', events=event, rtol=rtol, atol=atol)
+        if sol.status != 1:
+            return np.nan, np.nan
+        t0 = sol.t_events[0][0]
+        state = sol.y_events[0][0].copy()
+        state[1] = q_star
+        if not times:
+            state[2] = 0.0  # площадь считаем с первой точки x_max
+        times.append(t0)
+
+    return times[2] - times[0], abs(state[2])
+
+def _orbit_chunk(x0, y0, params, method):
+    if method == 'quadrature':
+        return orbit_period_quadrature(x0, y0, **params)
+    period = np.empty(len(x0))
+    area = np.empty(len(x0))
+    for i in range(len(x0)):
+        period[i], area[i] = orbit_period(x0[i], y0[i], **params)
+    return period, area
 
+# --- Карта периодов по сетке начальных условий ---
+def period_map(
+    x0_values,      # значения x0 (ось 0 карты)
+    y0_values,      # значения y0 (ось 1 карты)
+    a=a, b=b, c=c, d=d,
+    method='quadrature', # 'quadrature' — orbit_period_quadrature, 'events' — orbit_period
+    n_nodes=128,    # узлов квадратуры (method='quadrature')
+    workers=None,   # число процессов (None — по числу ядер, 1 — без пула)
+    chunk_size=1000, # начальных условий в одной задаче
+    rtol=1e-8,      # относительная точность (method='events')
+    atol=1e-10,     # абсолютная точность (method='events')
+):
+    # Возвращает словарь массивов формы (len(x0_values), len(y0_values)):
+    # period, area, x_min, x_max, y_min, y_max
+    X0, Y0 = np.meshgrid(np.asarray(x0_values, dtype=float), np.asarray(y0_values, dtype=float), indexing='ij')
+    x0, y0 = X0.ravel(), Y0.ravel()
+    if method == 'quadrature':
+        params = dict(a=a, b=b, c=c, d=d, n_nodes=n_nodes)
+    elif method == 'events':
+        params = dict(a=a, b=b, c=c, d=d, rtol=rtol, atol=atol)
+    else:
+        raise ValueError(f"Неизвестный метод: {method}")
+
+    starts = range(0, len(x0), chunk_size)
+    chunks = [(x0[i:i + chunk_size], y0[i:i + chunk_size], params, method) for i in starts]
+    if workers == 1 or len(chunks) <= 1:
+        outputs = [_orbit_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_orbit_chunk, *zip(*chunks)))
+
+    period = np.concatenate([out[0] for out in outputs]).reshape(X0.shape)
+    area = np.concatenate([out[1] for out in outputs]).reshape(X0.shape)
+    x_min, x_max, y_min, y_max = orbit_extrema(X0, Y0, a, b, c, d)
+    return dict(period=period, area=area, x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max)
+
+# --- Эксперименты ---
+def plot_time_series(ax, i, x, y):
+    x0, y0 = initial_conditions[i]
     # График численности по времени
-    # plt.subplot(1, 2, 1)
-    plt.plot(t, x, label='Жертвы (x)')
-    plt.plot(t, y, label='Хищники (y)')
-    plt.title(f'Эксперимент {i+1}: x0={x0}, y0={y0}')
+    ax.plot(t_eval, x, label='Жертвы (x)')
+    ax.plot(t_eval, y, label='Хищники (y)')
+    ax.set_title(f'Эксперимент {i+1}: x0={x0}, y0={y0}')
+    ax.set_xlabel('Время')
+    # ax.set_yscale('log')
+    ax.set_ylabel('Численность')
+    ax.legend()
+    ax.grid(True)
+
+def plot_phase_portrait(ax, i, x, y):
+    # Фазовый портрет (y от x)
+    ax.plot(x, y, color='purple')
+    ax.set_title(f'Фазовая траектория (Эксперимент {i+1})')
+    ax.set_xlabel('Жертвы (x)')
+    ax.set_ylabel('Хищники (y)')
+    ax.grid(True)
+
+def draw_time_series(ax, i):
+    x0, y0 = initial_conditions[i]
+    x, y = solve_ensemble(x0, y0, t_eval)[0]
+    plot_time_series(ax, i, x, y)
+
+def draw_phase_portrait(ax, i):
+    x0, y0 = initial_conditions[i]
+    x, y = solve_ensemble(x0, y0, t_eval)[0]
+    plot_phase_portrait(ax, i, x, y)
+
+def run_experiments():
+    x0, y0 = np.array(initial_conditions, dtype=float).T
+    solutions = solve_ensemble(x0, y0, t_eval)
+
+    for i in range(len(initial_conditions)):
+        x, y = solutions[i]
+
+        fig, ax = plt.subplots(figsize=(12, 7))
+        plot_time_series(ax, i, x, y)
+        plt.tight_layout()
+        plt.show()
+
+        fig, ax = plt.subplots(figsize=(12, 7))
+        plot_phase_portrait(ax, i, x, y)
+        plt.tight_layout()
+        plt.show()
+
+def run_invariant_test():
+    # Точность сохранения V против времени счета: RK45 и метод расщепления
+    import time
+
+    x0, y0 = np.array(initial_conditions, dtype=float).T
+    runs = [
+        ('RK45, rtol=1e-3', dict(method='RK45', rtol=1e-3, atol=1e-6)),
+        ('RK45, rtol=1e-6', dict(method='RK45', rtol=1e-6, atol=1e-9)),
+        ('RK45, rtol=1e-9', dict(method='RK45', rtol=1e-9, atol=1e-12)),
+        ('RK4, 10 подшагов', dict(method='rk4', substeps=10)),
+        ('Расщепление 2, 10 подшагов', dict(method='splitting', substeps=10)),
+        ('Расщепление 4, 5 подшагов', dict(method='splitting', substeps=5, order=4)),
+        ('Расщепление 4, 10 подшагов', dict(method='splitting', substeps=10, order=4)),
+    ]
+
+    plt.figure(figsize=(12, 7))
+    for label, options in runs:
+        start = time.perf_counter()
+        solutions = solve_ensemble(x0, y0, t_eval, **options)
+        elapsed = time.perf_counter() - start
+        drift = invariant_drift(solutions)
+        print(f"{label:28s} время {elapsed * 1e3:9.1f} мс, max |ΔV| = {np.nanmax(drift):.3e}, "
+              f"траекторий с x ≤ 0 или y ≤ 0: {np.isnan(drift).any(axis=1).sum()}")
+        # Точки, где хоть одна траектория ушла в x ≤ 0 или y ≤ 0, не рисуются
+        worst = np.nan_to_num(drift, nan=np.inf).max(axis=0)
+        plt.semilogy(t_eval, worst + 1e-17, label=f'{label} ({elapsed * 1e3:.0f} мс)')
+
+    plt.title('Дрейф первого интеграла V (максимум по начальным условиям)')
     plt.xlabel('Время')
-    # plt.yscale('log')
-    plt.ylabel('Численность')
-    
-    
+    plt.ylabel('|V(t) − V(0)|')
     plt.legend()
     plt.grid(True)
-
     plt.tight_layout()
     plt.show()
 
-    
-    plt.figure(figsize=(12, 7))
-    # Фазовый портрет (y от x)
-    # plt.subplot(1, 2, 2)
-    plt.plot(x, y, color='purple')
-    plt.title(f'Фазовая траектория (Эксперимент {i+1})')
-    plt.xlabel('Жертвы (x)')
-    plt.ylabel('Хищники (y)')
-    plt.grid(True)
+def run_extrema_test():
+    # Малые орбиты у равновесия: x0 лежит на орбите, поэтому x_min ≤ x0 ≤ x_max,
+    # и на всех экстремумах E = V − V_min то же, что в (x0, a/b). Допуск —
+    # округление самих x и y: dE/dr = d·(e^r − 1), dr ≈ eps
+    eps = np.finfo(float).eps
+    x0 = d / c * (1 + np.array([1e-12, 1e-10, 1e-8, 1e-6, 1e-4, 1e-2, 1.0, 10.0]))
+    y0 = np.full_like(x0, a / b)
+    E0 = orbit_excess(x0, y0)
+    x_min, x_max, y_min, y_max = orbit_extrema(x0, y0)
+    for name, value, E, slope in [
+        ('x_min', x_min, orbit_excess(x_min, y0), d * np.abs(c * x_min / d - 1)),
+        ('x_max', x_max, orbit_excess(x_max, y0), d * np.abs(c * x_max / d - 1)),
+        ('y_min', y_min, orbit_excess(d / c, y_min), a * np.abs(b * y_min / a - 1)),
+        ('y_max', y_max, orbit_excess(d / c, y_max), a * np.abs(b * y_max / a - 1)),
+    ]:
+        ok = np.abs(E - E0) <= 4 * eps * (E0 + slope)
+        print(f"{name}: V(экстремум) = V0 — {ok.all()}, max |ΔE|/E0 = {np.max(np.abs(E / E0 - 1)):.1e}")
+    print(f"x_min ≤ x0 ≤ x_max: {np.all((x_min <= x0) & (x0 <= x_max))}, "
+          f"y_min < a/b < y_max: {np.all((y_min < a / b) & (a / b < y_max))}")
+
+def run_period_map_test():
+    x0_values = np.linspace(1, 80, 100)
+    y0_values = np.linspace(1, 30, 100)
+    result = period_map(x0_values, y0_values)
 
+    plt.figure(figsize=(12, 7))
+    plt.pcolormesh(x0_values, y0_values, result['period'].T, shading='auto', cmap='viridis')
+    plt.colorbar(label='Период орбиты')
+    plt.plot(d / c, a / b, 'r+', markersize=12, label='Равновесие (d/c, a/b)')
+    plt.title('Карта периодов по начальным условиям')
+    plt.xlabel('Жертвы x0')
+    plt.ylabel('Хищники y0')
+    plt.legend()
     plt.tight_layout()
     plt.show()
+
+def add_plot_jobs(queue, output_dir):
+    # Все графики лабораторной для очереди common.rendering.RenderQueue
+    for i in range(len(initial_conditions)):
+        queue.add(os.path.join(output_dir, f"experiment_{i + 1}"), draw_time_series, i)
+        queue.add(os.path.join(output_dir, f"phase_{i + 1}"), draw_phase_portrait, i)
+
+# Запуск из корня репозитория: python -m lab3.lab3
+if __name__ == '__main__':
+    run_experiments()
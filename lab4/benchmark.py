@@ -0,0 +1,61 @@
+import os
+import sys
+
+import numpy as np
+
+# Точка входа (python lab4/benchmark.py): common/ берется из корня репозитория
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.benchmark import timed
+from lab4 import dt, T, R, simulate_launches
+
+# Параметры замера: случайная сетка запусков внутри диска
+n_launches = 10**6
+n_loop = 1000
+seed = 0
+
+
+def random_launches(n, seed=seed):
+    rng = np.random.default_rng(seed)
+    r = R * 0.8 * np.sqrt(rng.uniform(0, 1, n))
+    phi = rng.uniform(0, 2 * np.pi, n)
+    return dict(
+        omega=rng.uniform(0.1, 3.0, n),
+        x0=r * np.cos(phi),
+        y0=r * np.sin(phi),
+        vx0=rng.uniform(-3, 3, n),
+        vy0=rng.uniform(-3, 3, n),
+    )
+
+
+def euler_loop(omega, x0, y0, vx0, vy0):
+    # Скалярный цикл из simulate_motion без отрисовки
+    x, y, vx, vy = x0, y0, vx0, vy0
+    for i in range(int(T / dt) - 1):
+        vx, vy = vx + 2 * omega * vy * dt, vy - 2 * omega * vx * dt
+        x, y = x + vx * dt, y + vy * dt
+        if x**2 + y**2 > R**2:
+            break
+
+
+def run_benchmark():
+    launches = random_launches(n_launches)
+    small = {key: value[:n_loop] for key, value in launches.items()}
+
+    _, t_loop = timed(lambda: [euler_loop(*args) for args in zip(*small.values())])
+    exact, t_exact = timed(lambda: simulate_launches(**launches, method="exact"))
+    euler, t_euler = timed(lambda: simulate_launches(**launches, method="euler"))
+
+    both = exact["exited"] & euler["exited"]
+    print(f"Запусков: {n_launches:,}, T = {T} с, dt = {dt}")
+    print(f"Вышли из диска: точно {exact['exited'].mean():.1%}, Эйлер {euler['exited'].mean():.1%}")
+    gap = np.abs(exact["exit_time"][both] - euler["exit_time"][both])
+    print(f"Расхождение времени выхода (Эйлер против точного): медиана {np.median(gap):.3f} с, макс. {gap.max():.3f} с")
+    print("Запусков в секунду:")
+    print(f"  цикл Python ({n_loop} шт.):  {n_loop / t_loop:14,.0f}")
+    print(f"  пакетный Эйлер:            {n_launches / t_euler:14,.0f} ({t_euler:.1f} с)")
+    print(f"  точное решение:            {n_launches / t_exact:14,.0f} ({t_exact:.2f} с)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,79 @@
+import os
+import sys
+
+import numpy as np
+
+# Точка входа (python lab4/benchmark_lab4s.py): common/ берется из корня репозитория
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.benchmark import best_time
+from lab4s import adaptive_rk_solver, model_rhs, runge_kutta_4_solver, time_grid
+
+# Параметры замера: прогон из run_experiments_and_save (4000 шагов)
+omega = 2 * np.pi / 20.0
+t_span = (0.0, 40.0)
+dt = 0.01
+n_batch = 1000
+repeats = 3
+
+
+def rk4_reference(f, s0, t_span, dt, **f_args):
+    # Исходная реализация runge_kutta_4_solver
+    t_start, t_end = t_span
+    t_values = np.arange(t_start, t_end + dt, dt)
+    n_steps = len(t_values)
+    solution_history = np.zeros((n_steps, len(s0)))
+    solution_history[0] = s0
+    for n in range(n_steps - 1):
+        s_n = solution_history[n]
+        t_n = t_values[n]
+        k1 = f(s_n, t_n, **f_args)
+        k2 = f(s_n + 0.5 * dt * k1, t_n + 0.5 * dt, **f_args)
+        k3 = f(s_n + 0.5 * dt * k2, t_n + 0.5 * dt, **f_args)
+        k4 = f(s_n + dt * k3, t_n + dt, **f_args)
+        solution_history[n + 1] = s_n + (dt / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
+    return t_values, solution_history
+
+
+def run_benchmark():
+    s0 = np.array([0.0, 0.0, 1.0, 0.0])
+    rng = np.random.default_rng(0)
+    s0_batch = rng.uniform(-1, 1, (4, n_batch))
+
+    _, sol_ref = rk4_reference(model_rhs, s0, t_span, dt, omega=omega)
+    _, sol_new = runge_kutta_4_solver(model_rhs, s0, t_span, dt, omega=omega)
+    _, sol_batch = runge_kutta_4_solver(model_rhs, s0_batch, t_span, dt, omega=omega)
+    _, sol_one = rk4_reference(model_rhs, s0_batch[:, 7], t_span, dt, omega=omega)
+
+    print(f"Совпадение с исходной реализацией: {np.array_equal(sol_ref, sol_new)}")
+    print(f"Совпадение пакета с одиночным прогоном: {np.array_equal(sol_batch[:, :, 7], sol_one)}")
+
+    t_ref = best_time(lambda: rk4_reference(model_rhs, s0, t_span, dt, omega=omega), repeats)
+    t_new = best_time(lambda: runge_kutta_4_solver(model_rhs, s0, t_span, dt, omega=omega), repeats)
+    t_batch = best_time(lambda: runge_kutta_4_solver(model_rhs, s0_batch, t_span, dt, omega=omega), repeats)
+
+    print(f"RK4, {len(sol_ref) - 1} шагов:")
+    print(f"  исходная реализация:        {t_ref * 1e3:9.2f} мс")
+    print(f"  runge_kutta_4_solver, (4,): {t_new * 1e3:9.2f} мс ({t_ref / t_new:.1f}x)")
+    print(f"  пакет из {n_batch} состояний:    {t_batch * 1e3:9.2f} мс ({t_ref * n_batch / t_batch:.0f}x на состояние)")
+
+
+def run_adaptive_benchmark():
+    # Четыре случая эксперимента 1 на сетке dt = 0.01, эталон — точное решение
+    s0 = np.array([[0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 2.0, 0.0], [0.0, 0.0, 1.0, 1.0], [0.0, 0.0, 0.0, 0.0]]).T
+    t = time_grid(t_span, dt)
+    W = 2 * omega
+    u0, v0 = s0[2], s0[3]
+    x_exact = (u0 * np.sin(W * t[:, None]) + v0 * (1 - np.cos(W * t[:, None]))) / W
+
+    print(f"Правая часть, вызовов на {len(t) - 1} точек сетки (ошибка по x):")
+    _, sol_rk4 = runge_kutta_4_solver(model_rhs, s0, t_span, dt, omega=omega)
+    print(f"  RK4, dt = {dt}:        {4 * (len(t) - 1):7d}  ({np.abs(sol_rk4[:, 0] - x_exact).max():.1e})")
+    for method in ("RK45", "DOP853"):
+        _, sol_adaptive, sol = adaptive_rk_solver(model_rhs, s0, t_span, t, method=method, omega=omega)
+        print(f"  {method:7s} адаптивный: {sol.nfev:7d}  ({np.abs(sol_adaptive[:, 0] - x_exact).max():.1e})")
+
+
+if __name__ == "__main__":
+    run_benchmark()
+    run_adaptive_benchmark()
@@ -1,26 +1,35 @@
-import numpy as np
-import matplotlib.pyplot as plt
 import os
 
-# Параметры модели
+import numpy as np
+
+# matplotlib импортируется только в функциях отрисовки, чтобы расчеты
+# (simulate_motion, simulate_launches) не тянули его при импорте модуля
+
+# Параметры модели по умолчанию
 R = 5.0      # радиус вращающегося диска
 dt = 0.01    # шаг по времени
 T = 20.0     # общее время моделирования
-N = int(T / dt)
 
-# Создаем папку для графиков, если ее нет
-os.makedirs("lab4/plots_coriolis_only", exist_ok=True)
+PLOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plots_coriolis_only")
 
 color = "#F4A300"
 
-def draw_experiment_plot(x, y, omega, exp_num):
+# Эксперименты: параметры запуска для simulate_motion
+EXPERIMENTS = [
+    dict(omega=1.0, x0=1.0, y0=0.0, vx0=0.0, vy0=2.0),
+    dict(omega=2.0, x0=0.0, y0=1.0, vx0=2.0, vy0=0.0),
+    dict(omega=3.0, x0=2.0, y0=0.0, vx0=0.0, vy0=1.5),
+    dict(omega=1.5, x0=1.0, y0=1.0, vx0=1.0, vy0=-1.0),
+]
+
+def draw_experiment_plot(ax, x, y, omega, exp_num, R=R):
     """
-    Функция для отрисовки и сохранения графика траектории.
+    Функция для отрисовки траектории на переданных осях.
     """
-    fig, ax = plt.subplots(figsize=(6, 6))
+    from matplotlib.patches import Circle
 
     # Рисуем границу диска
-    circle = plt.Circle((0, 0), R, color="gray", linestyle="--", fill=False, linewidth=1)
+    circle = Circle((0, 0), R, color="gray", linestyle="--", fill=False, linewidth=1)
     ax.add_artist(circle)
 
     # Рисуем траекторию движения
@@ -36,10 +45,89 @@ def draw_experiment_plot(x, y, omega, exp_num):
     ax.set_title(f"Эксперимент {exp_num} (только сила Кориолиса)")
     ax.grid(True)
     ax.legend(loc="upper right")
-  
-    # Сохраняем график в файл
-    plt.savefig(f"lab4/plots_coriolis_only/experiment_{exp_num}.png", dpi=300,  bbox_inches='tight')
-    plt.close()
+
+def coriolis_rhs(t, s, omega, out=None):
+    """
+    Правая часть для общего каркаса common.ode: s = (x, y, vx, vy) по
+    последней оси, ускорение — только сила Кориолиса.
+    """
+    if out is None:
+        out = np.empty_like(s)
+    out[..., 0] = s[..., 2]
+    out[..., 1] = s[..., 3]
+    out[..., 2] = 2 * omega * s[..., 3]
+    out[..., 3] = -2 * omega * s[..., 2]
+    return out
+
+MODELS = {
+    'coriolis': dict(rhs=coriolis_rhs, dim=4, params=dict(omega=1.0), y0=[1.0, 0.0, 0.0, 2.0]),
+}
+
+def propagate_exact(omega, x0, y0, vx0, vy0, t):
+    """
+    Точное решение для ускорения Кориолиса ax = 2ωvy, ay = -2ωvx.
+
+    Скорость поворачивается как целое с угловой частотой Ω = 2ω, точка
+    движется по окружности радиуса |v0|/Ω. Параметры — скаляры или массивы
+    одной (или совместимой) формы S, t — одномерный массив; результат
+    x, y, vx, vy формы S + (len(t),). Массив t формы S + (1,) задает
+    отдельный момент для каждого запуска.
+    """
+    omega, x0, y0, vx0, vy0 = (np.asarray(v, dtype=float)[..., None] for v in (omega, x0, y0, vx0, vy0))
+    t = np.asarray(t, dtype=float)
+    Omega = 2 * omega
+    phase = Omega * t
+    cos_p, sin_p = np.cos(phase), np.sin(phase)
+
+    # sin(Ωt)/Ω и (1 - cos(Ωt))/Ω с пределами t и 0 при ω = 0
+    rotating = Omega != 0
+    safe_Omega = np.where(rotating, Omega, 1.0)
+    sin_term = np.where(rotating, sin_p / safe_Omega, t)
+    cos_term = np.where(rotating, (1 - cos_p) / safe_Omega, 0.0)
+
+    vx = vx0 * cos_p + vy0 * sin_p
+    vy = -vx0 * sin_p + vy0 * cos_p
+    x = x0 + vx0 * sin_term + vy0 * cos_term
+    y = y0 - vx0 * cos_term + vy0 * sin_term
+    return x, y, vx, vy
+
+def exit_time(omega, x0, y0, vx0, vy0, R=R):
+    """
+    Момент первого пересечения |r| = R (np.inf, если точка не покидает диск).
+
+    Корень находится аналитически: при ω ≠ 0 |r(t)|² = |c|² + ρ² +
+    2|c|ρ·cos(φ0 - Ωt), где c — центр окружности траектории, ρ — ее радиус;
+    при ω = 0 — из квадратного уравнения для прямой. Работает для массивов.
+    """
+    omega, x0, y0, vx0, vy0 = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (omega, x0, y0, vx0, vy0)))
+    Omega = 2 * omega
+    rotating = Omega != 0
+    safe_Omega = np.where(rotating, Omega, 1.0)
+
+    # Окружность траектории: центр c и радиус ρ
+    cx = x0 + vy0 / safe_Omega
+    cy = y0 - vx0 / safe_Omega
+    rho = np.hypot(vx0, vy0) / np.abs(safe_Omega)
+    c_norm = np.hypot(cx, cy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kappa = (R**2 - c_norm**2 - rho**2) / (2 * c_norm * rho)
+    reaches = (c_norm > 0) & (rho > 0) & (kappa < 1)
+    alpha = np.arccos(np.clip(kappa, -1, 1))
+    # Угол φ(t) = φ0 - Ωt между радиус-вектором от центра и направлением на c
+    phi0 = np.arctan2(y0 - cy, x0 - cx) - np.arctan2(cy, cx)
+    sign = np.sign(safe_Omega)
+    t1 = np.mod(sign * (phi0 - alpha), 2 * np.pi) / np.abs(safe_Omega)
+    t2 = np.mod(sign * (phi0 + alpha), 2 * np.pi) / np.abs(safe_Omega)
+    t_rot = np.where(reaches, np.minimum(t1, t2), np.inf)
+
+    # Прямолинейное движение: |r0 + v·t| = R, больший корень
+    v2 = vx0**2 + vy0**2
+    rv = x0 * vx0 + y0 * vy0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_line = (-rv + np.sqrt(rv**2 + v2 * (R**2 - x0**2 - y0**2))) / v2
+    t_line = np.where(v2 > 0, t_line, np.inf)
+
+    return np.where(rotating, t_rot, t_line)
 
 def simulate_motion(
     omega, # угловая скорость вращения диска 
@@ -47,11 +135,28 @@ def simulate_motion(
     y0,    # начальная координата y
     vx0,   # начальная скорость по x
     vy0,   # начальная скорость по y
-    exp_num # номер эксперимента (для сохранения графика)
+    R=R,   # радиус диска
+    dt=dt, # шаг по времени
+    T=T,   # общее время моделирования
+    method="euler" # "euler" — явный метод Эйлера, "exact" — точное решение
 ):
     """
     Основная функция моделирования движения.
+
+    Возвращает массивы t, x, y, vx, vy до момента выхода из диска
+    (включая первую точку за границей) или до конца моделирования.
     """
+    N = int(T / dt)
+
+    if method == "exact":
+        # Точная траектория на той же сетке, обрезанная в момент выхода
+        # из диска; последняя точка лежит ровно на границе
+        t_exit = exit_time(omega, x0, y0, vx0, vy0, R)
+        t = np.arange(N) * dt
+        t = np.append(t[t < t_exit], t_exit) if t_exit < t[-1] else t
+        x, y, vx, vy = propagate_exact(omega, x0, y0, vx0, vy0, t)
+        return t, x, y, vx, vy
+
     # Массивы для хранения координат и скоростей
     x = np.zeros(N)
     y = np.zeros(N)
@@ -63,6 +168,7 @@ def simulate_motion(
     vx[0], vy[0] = vx0, vy0
 
     # Цикл моделирования
+    n = N
     for i in range(N - 1):
         x_i, y_i = x[i], y[i]
         vx_i, vy_i = vx[i], vy[i]
@@ -81,17 +187,157 @@ def simulate_motion(
 
         # Проверка выхода за границу диска
         if x[i + 1]**2 + y[i + 1]**2 > R**2:
-            x = x[:i + 2]
-            y = y[:i + 2]
+            n = i + 2
             break
 
-    # Отрисовка результата
-    draw_experiment_plot(x, y, omega, exp_num)
+    t = np.arange(n) * dt
+    return t, x[:n], y[:n], vx[:n], vy[:n]
+
+def _boundary_fraction(x, y, dx, dy, R):
+    """Доля шага s ∈ (0, 1], на которой отрезок (x, y) + s·(dx, dy) пересекает |r| = R."""
+    a = dx**2 + dy**2
+    b = 2 * (x * dx + y * dy)
+    c = x**2 + y**2 - R**2
+    return (-b + np.sqrt(b**2 - 4 * a * c)) / (2 * a)
+
+def simulate_launches(
+    omega, x0, y0, vx0, vy0, # параметры запусков: скаляры или массивы одной формы
+    R=R,                     # радиус диска
+    dt=dt,                   # шаг по времени
+    T=T,                     # общее время моделирования
+    method="euler",          # "euler" — тот же шаг, что в simulate_motion, "exact" — точное решение
+    trajectories=False       # сохранять ли траектории x, y формы (n, N)
+):
+    """
+    Пакетное моделирование сетки запусков с заморозкой частиц на границе R.
+
+    Возвращает словарь массивов формы запусков: exited, exit_time, exit_angle
+    (np.inf / np.nan для оставшихся в диске), path_length; при trajectories=True
+    также t, x, y, где после выхода координаты остаются в точке пересечения
+    границы |r| = R (для "euler" — интерполированной внутри шага выхода).
+    """
+    params = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (omega, x0, y0, vx0, vy0)))
+    shape = params[0].shape
+    omega, x0, y0, vx0, vy0 = (v.ravel() for v in params)
+    n = omega.size
+    n_steps = int(T / dt)
+    t_max = (n_steps - 1) * dt
+
+    if method == "exact":
+        t_exit = exit_time(omega, x0, y0, vx0, vy0, R)
+        exited = t_exit <= t_max
+        t_exit = np.where(exited, t_exit, np.inf)
+        # Точка выхода: t задается отдельно для каждого запуска, форма (n, 1)
+        x_e, y_e, _, _ = propagate_exact(omega, x0, y0, vx0, vy0, np.where(exited, t_exit, 0.0)[:, None])
+        exit_angle = np.where(exited, np.arctan2(y_e[:, 0], x_e[:, 0]), np.nan)
+        # Модуль скорости сохраняется, поэтому путь = |v0|·t
+        path_length = np.hypot(vx0, vy0) * np.minimum(t_exit, t_max)
+        result = dict(exited=exited, exit_time=t_exit, exit_angle=exit_angle, path_length=path_length)
+        if trajectories:
+            t = np.arange(n_steps) * dt
+            x, y, _, _ = propagate_exact(omega, x0, y0, vx0, vy0, t)
+            after = t > t_exit[:, None]
+            x = np.where(after, x_e, x)
+            y = np.where(after, y_e, y)
+            result.update(t=t, x=x, y=y)
+    elif method == "euler":
+        exit_time_ = np.full(n, np.inf)
+        exit_angle = np.full(n, np.nan)
+        path_length = np.zeros(n)
+        if trajectories:
+            x_hist = np.empty((n, n_steps))
+            y_hist = np.empty((n, n_steps))
+            x_hist[:, 0], y_hist[:, 0] = x0, y0
+
+        # Сжатые массивы только для частиц, еще находящихся в диске
+        idx = np.arange(n)
+        x, y, vx, vy, om = x0.copy(), y0.copy(), vx0.copy(), vy0.copy(), omega
+        path = np.zeros(n)
+        for i in range(n_steps - 1):
+            if idx.size == 0:
+                break
+            # Тот же явный шаг, что и в simulate_motion
+            vx_new = vx + 2 * om * vy * dt
+            vy_new = vy - 2 * om * vx * dt
+            dx, dy = vx_new * dt, vy_new * dt
+            x_new, y_new = x + dx, y + dy
+            step = np.sqrt(dx * dx + dy * dy)
+            out = x_new * x_new + y_new * y_new > R**2
+
+            if trajectories:
+                x_hist[idx, i + 1] = x_new
+                y_hist[idx, i + 1] = y_new
+
+            if out.any():
+                # Вышедшие частицы: точка пересечения границы внутри шага
+                s = _boundary_fraction(x[out], y[out], dx[out], dy[out], R)
+                done = idx[out]
+                exit_time_[done] = (i + s) * dt
+                x_exit = x[out] + s * dx[out]
+                y_exit = y[out] + s * dy[out]
+                exit_angle[done] = np.arctan2(y_exit, x_exit)
+                path_length[done] = path[out] + s * step[out]
+                if trajectories:
+                    # С узла i + 1 (уже после выхода) частица стоит на границе
+                    x_hist[done, i + 1:] = x_exit[:, None]
+                    y_hist[done, i + 1:] = y_exit[:, None]
+
+                keep = ~out
+                idx, om, path, step = idx[keep], om[keep], path[keep], step[keep]
+                x_new, y_new, vx_new, vy_new = x_new[keep], y_new[keep], vx_new[keep], vy_new[keep]
+
+            path += step
+            x, y, vx, vy = x_new, y_new, vx_new, vy_new
+
+        path_length[idx] = path
+        result = dict(exited=np.isfinite(exit_time_), exit_time=exit_time_, exit_angle=exit_angle, path_length=path_length)
+        if trajectories:
+            result.update(t=np.arange(n_steps) * dt, x=x_hist, y=y_hist)
+    else:
+        raise ValueError(f"Неизвестный метод: {method}")
+
+    for key in ("exited", "exit_time", "exit_angle", "path_length"):
+        result[key] = result[key].reshape(shape)
+    if trajectories:
+        result["x"] = result["x"].reshape(shape + (n_steps,))
+        result["y"] = result["y"].reshape(shape + (n_steps,))
+    return result
+
+# --- Отрисовка экспериментов ---
+def draw_experiment(ax, i, method="euler"):
+    spec = EXPERIMENTS[i]
+    _, x, y, _, _ = simulate_motion(**spec, method=method)
+    draw_experiment_plot(ax, x, y, spec["omega"], i + 1)
+
+def run_experiments(output_dir=PLOTS_DIR, dpi=300, formats=("png",), method="euler"):
+    """
+    Расчет всех экспериментов и сохранение графиков в output_dir.
+    """
+    import matplotlib.pyplot as plt
+
+    os.makedirs(output_dir, exist_ok=True)
+    for i in range(len(EXPERIMENTS)):
+        fig, ax = plt.subplots(figsize=(6, 6))
+        draw_experiment(ax, i, method)
+        for fmt in formats:
+            fig.savefig(os.path.join(output_dir, f"experiment_{i + 1}.{fmt}"), dpi=dpi, bbox_inches='tight')
+        plt.close(fig)
+
+    print(f"Моделирование завершено! Графики сохранены в папке '{output_dir}'.")
+
+def add_plot_jobs(queue, output_dir):
+    # Все графики лабораторной для очереди common.rendering.RenderQueue
+    for i in range(len(EXPERIMENTS)):
+        queue.add(os.path.join(output_dir, f"experiment_{i + 1}"), draw_experiment, i, figsize=(6, 6))
+
+if __name__ == '__main__':
+    import argparse
 
-# --- Запуск экспериментов ---
-simulate_motion(omega=1.0, x0=1.0, y0=0.0, vx0=0.0, vy0=2.0, exp_num=1)
-simulate_motion(omega=2.0, x0=0.0, y0=1.0, vx0=2.0, vy0=0.0, exp_num=2)
-simulate_motion(omega=3.0, x0=2.0, y0=0.0, vx0=0.0, vy0=1.5, exp_num=3)
-simulate_motion(omega=1.5, x0=1.0, y0=1.0, vx0=1.0, vy0=-1.0, exp_num=4)
+    parser = argparse.ArgumentParser(description="Движение точки на вращающемся диске (только сила Кориолиса)")
+    parser.add_argument('--output', default=PLOTS_DIR, help="папка для графиков")
+    parser.add_argument('--formats', nargs='+', default=['png'], help="форматы файлов, например png svg")
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--method', default='euler', choices=['euler', 'exact'])
+    args = parser.parse_args()
 
-print("Моделирование завершено! Графики сохранены в папке 'lab4/plots_coriolis_only'.")
\ No newline at end of file
+    run_experiments(args.output, args.dpi, args.formats, args.method)
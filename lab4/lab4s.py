@@ -1,6 +1,11 @@
+import inspect
+import os
+
 import numpy as np
 import matplotlib.pyplot as plt
-import os
+from scipy.integrate import solve_ivp
+
+from common.ode import integrate
 
 # Определяем базовую директорию, где лежит скрипт. Файлы будут сохраняться сюда.
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -9,8 +14,18 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Блок с функциями модели и решателя (остается без изменений)
 # =============================================================================
 
-def model_rhs(s, t, omega):
-    """Определяет правую часть системы ОДУ."""
+def model_rhs(s, t, omega, out=None):
+    """Определяет правую часть системы ОДУ.
+
+    s формы (4,) или (4, n) для n состояний сразу. Если передан out,
+    результат записывается в него без выделения нового массива.
+    """
+    if out is not None:
+        # Только срезы-представления: out[0:2] = (u, v), затем ускорения
+        out[0:2] = s[2:4]
+        np.multiply(2 * omega, s[3:4], out=out[2:3])
+        np.multiply(-2 * omega, s[2:3], out=out[3:4])
+        return out
     x, y, u, v = s
     dxdt = u
     dydt = v
@@ -18,25 +33,88 @@ def model_rhs(s, t, omega):
     dvdt = -2 * omega * u
     return np.array([dxdt, dydt, dudt, dvdt])
 
-def runge_kutta_4_solver(f, s0, t_span, dt, **f_args):
-    """Решает систему ОДУ методом Рунге-Кутты 4-го порядка."""
+def model_rhs_state_last(t, s, omega):
+    """model_rhs в протоколе common.ode: rhs(t, s) с s формы (..., 4)."""
+    return np.moveaxis(model_rhs(np.moveaxis(s, -1, 0), t, omega), 0, -1)
+
+MODELS = {
+    'coriolis_rk': dict(rhs=model_rhs_state_last, dim=4, params=dict(omega=2 * np.pi / 20.0), y0=[0.0, 0.0, 1.0, 0.0]),
+}
+
+def _time_first(f, f_args, with_out):
+    """f(s, t, **f_args) как правая часть rhs(t, s) для common.ode.
+
+    Раскладка s (d,) или (d, n) сохраняется: RK4 с общим шагом от нее не
+    зависит, а строки x, y, u, v остаются непрерывными. with_out — передавать
+    ли буфер out (нужен только пакету: для одного состояния лишний
+    именованный аргумент заметно удорожает вызов).
+    """
+    if with_out:
+        def rhs(t, s, out=None):
+            return f(s, t, out=out, **f_args)
+        return rhs
+
+    def rhs(t, s):
+        return f(s, t, **f_args)
+    return rhs
+
+def time_grid(t_span, dt):
+    """Сетка t_start + i*dt, не выходящая за t_end.
+
+    np.arange(t_start, t_end + dt, dt) из-за округления может дать лишнюю
+    точку за t_end (например, 0.30000000000000004 при t_end = 0.3).
+    """
     t_start, t_end = t_span
-    t_values = np.arange(t_start, t_end + dt, dt)
-    n_steps = len(t_values)
-    solution_history = np.zeros((n_steps, len(s0)))
-    solution_history[0] = s0
-    
-    for n in range(n_steps - 1):
-        s_n = solution_history[n]
-        t_n = t_values[n]
-        k1 = f(s_n, t_n, **f_args)
-        k2 = f(s_n + 0.5 * dt * k1, t_n + 0.5 * dt, **f_args)
-        k3 = f(s_n + 0.5 * dt * k2, t_n + 0.5 * dt, **f_args)
-        k4 = f(s_n + dt * k3, t_n + dt, **f_args)
-        s_n_plus_1 = s_n + (dt / 6.0) * (k1 + 2*k2 + 2*k3 + k4)
-        solution_history[n+1] = s_n_plus_1
-        
-    return t_values, solution_history
+    # Допуск на погрешность деления, чтобы не потерять точку t_end
+    n_steps = int(np.floor((t_end - t_start) / dt * (1 + 1e-12)))
+    # i*dt тоже округляется (3*0.1 > 0.3), поэтому сетка обрезается по t_end
+    return np.minimum(t_start + dt * np.arange(n_steps + 1), t_end)
+
+def runge_kutta_4_solver(f, s0, t_span, dt, **f_args):
+    """Решает систему ОДУ методом Рунге-Кутты 4-го порядка.
+
+    Шаг — common.ode.rk4 на сетке time_grid(t_span, dt). f(s, t, **f_args)
+    может поддерживать параметр out; s0 формы (d,) или (d, n): n начальных
+    состояний проходят через один цикл, и тогда стадии считаются в
+    буферах, выделенных один раз. Возвращает t_values и историю формы
+    (n_steps,) + s0.shape.
+    """
+    s0 = np.asarray(s0, dtype=float)
+    t_values = time_grid(t_span, dt)
+    rhs = _time_first(f, f_args, s0.ndim > 1 and 'out' in inspect.signature(f).parameters)
+    return t_values, integrate(rhs, s0, t_values, method='rk4', h=dt)
+
+def adaptive_rk_solver(f, s0, t_span, t_eval=None, method='DOP853', rtol=1e-8, atol=1e-10, **f_args):
+    """Вложенный метод Рунге-Кутты с адаптивным шагом (RK45 или DOP853).
+
+    Шаг выбирается по оценке локальной ошибки (rtol, atol), значения на
+    произвольной сетке t_eval берутся из плотного вывода. f(s, t, **f_args) —
+    та же правая часть, что и для runge_kutta_4_solver; s0 формы (d,) или
+    (d, n). Возвращает t_values, историю формы (len(t_eval),) + s0.shape и
+    результат solve_ivp (sol.sol — плотный вывод, sol.nfev — число вызовов f).
+    """
+    # solve_ivp работает с плоским вектором, поэтому пакет состояний
+    # разворачивается в (d*n,) и обратно
+    shape = np.shape(s0)
+
+    def ode(t, s):
+        return np.ravel(f(s.reshape(shape), t, **f_args))
+
+    sol = solve_ivp(ode, t_span, np.ravel(s0), method=method, rtol=rtol, atol=atol, dense_output=True)
+    t_values = np.asarray(t_eval, dtype=float) if t_eval is not None else sol.t
+    solution_history = sol.sol(t_values).T.reshape((len(t_values),) + shape)
+    return t_values, solution_history, sol
+
+def integrate_cases(s0, t_span, dt, method='DOP853', **f_args):
+    """Траектории model_rhs на сетке time_grid(t_span, dt).
+
+    method='rk4' — фиксированный шаг dt, 'RK45' или 'DOP853' — адаптивный
+    шаг с плотным выводом на ту же сетку.
+    """
+    if method == 'rk4':
+        return runge_kutta_4_solver(model_rhs, s0, t_span, dt, **f_args)
+    t, solution_history, _ = adaptive_rk_solver(model_rhs, s0, t_span, time_grid(t_span, dt), method=method, **f_args)
+    return t, solution_history
 
 # =============================================================================
 # НОВАЯ ВСПОМОГАТЕЛЬНАЯ ФУНКЦИЯ ДЛЯ ОТРИСОВКИ СТРЕЛОК
@@ -68,8 +146,11 @@ def add_arrows_to_plot(ax, x, y, u, v):
 # Блок проведения и визуализации экспериментов (с изменениями)
 # =============================================================================
 
-def run_experiments_and_save():
-    """Запускает эксперименты и сохраняет результаты в файлы."""
+def run_experiments_and_save(method='DOP853'):
+    """Запускает эксперименты и сохраняет результаты в файлы.
+
+    method — решатель из integrate_cases: 'rk4', 'RK45' или 'DOP853'.
+    """
     
     T = 20.0
     omega_base = 2 * np.pi / T
@@ -87,10 +168,13 @@ def run_experiments_and_save():
         {'u0': 0.0, 'v0': 0.0, 'title': 'Нулевая скорость (u0=0, v0=0)'}
     ]
     
-    for ax, case in zip(axs1.flat, velocity_cases):
-        s0 = np.array([0.0, 0.0, case['u0'], case['v0']])
-        t, sol = runge_kutta_4_solver(model_rhs, s0, t_span, dt, omega=omega_base)
-        x, y, u, v = sol[:, 0], sol[:, 1], sol[:, 2], sol[:, 3]
+    # Все случаи считаются одним пакетом: s0 формы (4, n_cases)
+    s0_all = np.array([[0.0, 0.0, case['u0'], case['v0']] for case in velocity_cases]).T
+    t, sol_all = integrate_cases(s0_all, t_span, dt, method=method, omega=omega_base)
+
+    for i, (ax, case) in enumerate(zip(axs1.flat, velocity_cases)):
+        s0 = s0_all[:, i]
+        x, y, u, v = sol_all[:, 0, i], sol_all[:, 1, i], sol_all[:, 2, i], sol_all[:, 3, i]
         
         ax.plot(x, y, color='blue', zorder=1)
         ax.plot(s0[0], s0[1], 'go', markersize=8, label='Старт', zorder=3)
@@ -118,11 +202,13 @@ def run_experiments_and_save():
         {'x0': 2.0, 'y0': 1.0, 'label': 'Старт из точки (2,1)'}
     ]
     
+    s0_all = np.array([[case['x0'], case['y0'], 1.0, 0.0] for case in position_cases]).T
+    t, sol_all = integrate_cases(s0_all, t_span, dt, method=method, omega=omega_base)
+
     colors = ['blue', 'green']
-    for color, case in zip(colors, position_cases):
-        s0 = np.array([case['x0'], case['y0'], 1.0, 0.0])
-        t, sol = runge_kutta_4_solver(model_rhs, s0, t_span, dt, omega=omega_base)
-        x, y, u, v = sol[:, 0], sol[:, 1], sol[:, 2], sol[:, 3]
+    for i, (color, case) in enumerate(zip(colors, position_cases)):
+        s0 = s0_all[:, i]
+        x, y, u, v = sol_all[:, 0, i], sol_all[:, 1, i], sol_all[:, 2, i], sol_all[:, 3, i]
         
         ax2.plot(x, y, color=color, label=case['label'], zorder=1)
         ax2.plot(s0[0], s0[1], 'o', color=color, markersize=8, zorder=3)
@@ -150,10 +236,14 @@ def run_experiments_and_save():
     ]
     
     s0 = np.array([0.0, 0.0, 1.0, 0.0])
+    # Одно начальное состояние, разные ω: omega формы (n_cases,) транслируется по столбцам
+    omegas = np.array([case['omega'] for case in omega_cases])
+    s0_all = np.repeat(s0[:, None], len(omega_cases), axis=1)
+    t, sol_all = integrate_cases(s0_all, t_span, dt, method=method, omega=omegas)
+
     colors = ['blue', 'red']
-    for color, case in zip(colors, omega_cases):
-        t, sol = runge_kutta_4_solver(model_rhs, s0, t_span, dt, omega=case['omega'])
-        x, y, u, v = sol[:, 0], sol[:, 1], sol[:, 2], sol[:, 3]
+    for i, (color, case) in enumerate(zip(colors, omega_cases)):
+        x, y, u, v = sol_all[:, 0, i], sol_all[:, 1, i], sol_all[:, 2, i], sol_all[:, 3, i]
         
         ax3.plot(x, y, color=color, label=case['label'], zorder=1)
         add_arrows_to_plot(ax3, x, y, u, v) # Вызов новой функции
@@ -172,6 +262,7 @@ def run_experiments_and_save():
     plt.close(fig3)
 
 # --- Запуск всех экспериментов ---
+# Запуск из корня репозитория: python -m lab4.lab4s
 if __name__ == "__main__":
     if not os.path.exists(BASE_DIR):
         os.makedirs(BASE_DIR)
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+
+# Точка входа (python lab5/benchmark.py): common/ берется из корня репозитория
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.benchmark import best_time
+from lab5 import INITIAL_CONDITIONS, L, advance_upwind, nu, nx
+
+# Параметры замера: явная схема против потока на сетке лабораторной и на большой сетке
+n_steps = 200
+nx_large = 10**6
+repeats = 3
+
+
+def upwind_loop(u0, nu, n_steps):
+    # Исходный поэлементный цикл из run_experiment
+    u = u0.copy()
+    for _ in range(n_steps):
+        un = u.copy()
+        for i in range(len(u)):
+            u[i] = un[i] - nu * (un[i] - un[i - 1])
+    return u
+
+
+def run_benchmark():
+    x = np.linspace(0, L, nx)
+    rows = np.stack([ic(x, L) for ic in INITIAL_CONDITIONS.values()])
+
+    loop = [upwind_loop(u0, nu, n_steps) for u0 in rows]
+    kernel = advance_upwind(rows, nu, n_steps)
+    print(f"Совпадение с циклом (все НУ одним массивом): {np.array_equal(np.stack(loop), kernel)}")
+
+    t_loop = best_time(lambda: [upwind_loop(u0, nu, n_steps) for u0 in rows], 1)
+    t_kernel = best_time(lambda: advance_upwind(rows, nu, n_steps), repeats)
+    print(f"{len(rows)} НУ, nx = {nx}, {n_steps} шагов:")
+    print(f"  поэлементный цикл:   {t_loop * 1e3:10.2f} мс")
+    print(f"  векторное ядро:      {t_kernel * 1e3:10.2f} мс ({t_loop / t_kernel:.0f}x)")
+
+    x_large = np.linspace(0, L, nx_large)
+    rows_large = np.stack([ic(x_large, L) for ic in INITIAL_CONDITIONS.values()])
+    t_large = best_time(lambda: advance_upwind(rows_large, nu, 20), 1) / 20
+    print(f"  nx = {nx_large:,}, {len(rows)} НУ: {t_large * 1e3:.1f} мс на шаг")
+
+
+if __name__ == "__main__":
+    run_benchmark()
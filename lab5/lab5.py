@@ -1,7 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
+import glob
+import json
 import os
+import time
 import imageio.v2 as imageio # Added for GIF creation
+from scipy.linalg import lapack
 
 # --- Основные параметры симуляции (общие для всех экспериментов) ---
 L = 2.0       # Длина пространственной области
@@ -18,7 +22,446 @@ print(dx)
 print(dt)
 
 
-def run_experiment(experiment_name, initial_condition_func):
+class CyclicTridiagonalSolver:
+    """
+    Решатель циклической трехдиагональной системы A x = b.
+
+    A задается только диагоналями: lower[i] = A[i, i-1], diag[i] = A[i, i],
+    upper[i] = A[i, i+1], индексы по модулю n, так что lower[0] = A[0, n-1]
+    и upper[n-1] = A[n-1, 0] — угловые элементы периодичности. Матрица
+    факторизуется один раз (LAPACK gttrf), каждое решение — O(n) через
+    формулу Шермана-Моррисона.
+    """
+
+    def __init__(self, lower, diag, upper, n):
+        lower, diag, upper = (np.broadcast_to(np.asarray(v, dtype=float), (n,)) for v in (lower, diag, upper))
+        self.n = n
+
+        # A = B + u v^T: B — обычная трехдиагональная матрица, углы вынесены
+        # в поправку ранга 1 с u = (gamma, 0, ..., 0, alpha), v = (1, 0, ..., 0, beta/gamma)
+        alpha = upper[-1]    # A[n-1, 0]
+        beta = lower[0]      # A[0, n-1]
+        # gamma — любое ненулевое число; -diag[0] уменьшает ошибки округления
+        # в B[0, 0], при нулевом диагональном элементе берется 1
+        gamma = -diag[0] if diag[0] != 0 else 1.0
+        b = diag.copy()
+        b[0] -= gamma
+        b[-1] -= alpha * beta / gamma
+        *self._lu, info = lapack.dgttrf(lower[1:], b, upper[:-1])
+        if info != 0:
+            raise np.linalg.LinAlgError(f"dgttrf: info = {info}, матрица B вырождена")
+        self._v_last = beta / gamma
+
+        u = np.zeros(n)
+        u[0], u[-1] = gamma, alpha
+        self._z = self._solve_banded(u[:, None])[:, 0]
+        vz = self._z[0] + self._v_last * self._z[-1]
+        denominator = 1.0 + vz
+        # 1 + v·z = 0 ровно тогда, когда вырождена сама A; в арифметике с
+        # плавающей точкой ноль приходит как остаток порядка n·eps
+        if not abs(denominator) > n * np.finfo(float).eps * (1.0 + abs(vz)):
+            raise np.linalg.LinAlgError("Циклическая матрица вырождена: 1 + v·z ≈ 0")
+        self._z_factor = 1.0 / denominator
+
+    def _solve_banded(self, rhs):
+        x, info = lapack.dgttrs(*self._lu, rhs)
+        if info != 0:
+            raise np.linalg.LinAlgError(f"dgttrs: info = {info}")
+        return x
+
+    def solve(self, rhs):
+        """Решение для b формы (n,) или (n, k) — k правых частей сразу."""
+        rhs = np.asarray(rhs, dtype=float)
+        columns = rhs.reshape(self.n, -1)
+        y = self._solve_banded(columns)
+        # x = y - (v·y) / (1 + v·z) * z
+        correction = (y[0] + self._v_last * y[-1]) * self._z_factor
+        y -= correction * self._z[:, None]
+        return y.reshape(rhs.shape)
+
+
+def implicit_centered_solver(nu, nx):
+    """Оператор неявной центральной схемы: u_i + nu/2 (u_{i+1} - u_{i-1}) = u_i^n."""
+    nu_half = nu / 2
+    return CyclicTridiagonalSolver(-nu_half, 1.0, nu_half, nx)
+
+
+def upwind_step(u, out, nu):
+    """
+    Один шаг явной схемы против потока u_i - nu (u_i - u_{i-1}) с периодическим
+    u_{-1} = u_{nx-1}. u и out формы (..., nx): строки — независимые решения.
+    Порядок операций тот же, что в поэлементном цикле, результат совпадает побитово.
+    """
+    np.subtract(u[..., 1:], u[..., :-1], out=out[..., 1:])
+    out[..., 1:] *= nu
+    np.subtract(u[..., 1:], out[..., 1:], out=out[..., 1:])
+    out[..., 0] = u[..., 0] - nu * (u[..., 0] - u[..., -1])
+    return out
+
+
+def advance_upwind(u0, nu, n_steps):
+    """n_steps шагов upwind_step с двумя буферами вместо копии на каждом шаге."""
+    u = np.array(u0, dtype=float)
+    buffer = np.empty_like(u)
+    for _ in range(n_steps):
+        upwind_step(u, buffer, nu)
+        u, buffer = buffer, u
+    return u
+
+
+# --- Библиотека разностных схем ---
+# Схема — фабрика make(nu, nx) -> step(u, out): один шаг по времени для
+# u формы (..., nx) с периодическими границами, результат пишется в out.
+# Все схемы рассчитаны на c > 0.
+
+def make_upwind(nu, nx):
+    return lambda u, out: upwind_step(u, out, nu)
+
+
+def make_implicit_centered(nu, nx):
+    solver = implicit_centered_solver(nu, nx)
+
+    def step(u, out):
+        # Строки u — независимые решения, решателю нужны столбцы
+        out[...] = solver.solve(u.reshape(-1, nx).T).T.reshape(u.shape)
+        return out
+    return step
+
+
+def make_lax_wendroff(nu, nx):
+    def step(u, out):
+        u_right, u_left = np.roll(u, -1, axis=-1), np.roll(u, 1, axis=-1)
+        out[...] = u - nu / 2 * (u_right - u_left) + nu**2 / 2 * (u_right - 2 * u + u_left)
+        return out
+    return step
+
+
+# Ограничители наклона phi(r) для MUSCL/TVD
+LIMITERS = {
+    'minmod': lambda r: np.maximum(0, np.minimum(1, r)),
+    'van_leer': lambda r: (r + np.abs(r)) / (1 + np.abs(r)),
+    'superbee': lambda r: np.maximum.reduce([np.zeros_like(r), np.minimum(2 * r, 1), np.minimum(r, 2)]),
+    'mc': lambda r: np.maximum(0, np.minimum.reduce([2 * r, (1 + r) / 2, np.full_like(r, 2)])),
+}
+
+
+def make_muscl(limiter):
+    phi = LIMITERS[limiter]
+
+    def make(nu, nx):
+        def step(u, out):
+            # Поток через i+1/2: u_i + (1 - nu)/2 * phi(r_i) * (u_{i+1} - u_i),
+            # r_i = (u_i - u_{i-1}) / (u_{i+1} - u_i)
+            du_right = np.roll(u, -1, axis=-1) - u
+            du_left = u - np.roll(u, 1, axis=-1)
+            safe = np.where(np.abs(du_right) > 1e-14, du_right, 1e-14)
+            flux = u + (1 - nu) / 2 * phi(du_left / safe) * du_right
+            out[...] = u - nu * (flux - np.roll(flux, 1, axis=-1))
+            return out
+        return step
+    return make
+
+
+def weno5_interface(u):
+    """WENO5-реконструкция u_{i+1/2} слева (поток против течения при c > 0)."""
+    u_m2, u_m1 = np.roll(u, 2, axis=-1), np.roll(u, 1, axis=-1)
+    u_p1, u_p2 = np.roll(u, -1, axis=-1), np.roll(u, -2, axis=-1)
+
+    q0 = (2 * u_m2 - 7 * u_m1 + 11 * u) / 6
+    q1 = (-u_m1 + 5 * u + 2 * u_p1) / 6
+    q2 = (2 * u + 5 * u_p1 - u_p2) / 6
+
+    beta0 = 13 / 12 * (u_m2 - 2 * u_m1 + u)**2 + 1 / 4 * (u_m2 - 4 * u_m1 + 3 * u)**2
+    beta1 = 13 / 12 * (u_m1 - 2 * u + u_p1)**2 + 1 / 4 * (u_m1 - u_p1)**2
+    beta2 = 13 / 12 * (u - 2 * u_p1 + u_p2)**2 + 1 / 4 * (3 * u - 4 * u_p1 + u_p2)**2
+
+    eps = 1e-6
+    a0, a1, a2 = 0.1 / (eps + beta0)**2, 0.6 / (eps + beta1)**2, 0.3 / (eps + beta2)**2
+    return (a0 * q0 + a1 * q1 + a2 * q2) / (a0 + a1 + a2)
+
+
+def make_weno5(nu, nx):
+    # WENO5 по пространству и SSP-RK3 (Шу-Ошер) по времени
+    def rate(u):
+        flux = weno5_interface(u)
+        return -nu * (flux - np.roll(flux, 1, axis=-1))
+
+    def step(u, out):
+        u1 = u + rate(u)
+        u2 = 3 / 4 * u + 1 / 4 * (u1 + rate(u1))
+        out[...] = 1 / 3 * u + 2 / 3 * (u2 + rate(u2))
+        return out
+    return step
+
+
+SCHEMES = {
+    'upwind': make_upwind,
+    'implicit_centered': make_implicit_centered,
+    'lax_wendroff': make_lax_wendroff,
+    'muscl_minmod': make_muscl('minmod'),
+    'muscl_van_leer': make_muscl('van_leer'),
+    'muscl_superbee': make_muscl('superbee'),
+    'muscl_mc': make_muscl('mc'),
+    'weno5': make_weno5,
+}
+
+
+def advance(scheme, u0, nu, n_steps):
+    """n_steps шагов схемы из SCHEMES с двумя буферами."""
+    u = np.array(u0, dtype=float)
+    step = SCHEMES[scheme](nu, u.shape[-1])
+    buffer = np.empty_like(u)
+    for _ in range(n_steps):
+        step(u, buffer)
+        u, buffer = buffer, u
+    return u
+
+
+# --- Точное решение ---
+def exact_solution(initial_condition_func, x, t, L=L, c=c, period=None):
+    """
+    Точное решение u0(x - c·t), продолженное с периодом period (по умолчанию L).
+
+    Для сетки np.linspace(0, L, nx) схемы замыкаются через u_{-1} = u_{nx-1},
+    то есть их период — nx·dx, и эталоном служит period=nx·dx.
+    """
+    return initial_condition_func(np.mod(x - c * t, L if period is None else period), L)
+
+
+class SpectralShift:
+    """
+    Перенос сеточной функции на периодической сетке через БПФ.
+
+    Решение u(x, t) = u0(x - c·t) в спектре — умножение на exp(-i k c t),
+    поэтому любой момент времени получается одним обратным БПФ, без шагов
+    по времени. Период — nx·dx, как у разностных схем с u_{-1} = u_{nx-1}.
+
+    Это тригонометрическая интерполяция сеточных значений: с точным решением
+    она совпадает до округления только для гладких периодических u0
+    (SMOOTH_INITIAL_CONDITIONS на сетке x_i = i·L/nx). Для разрывных u0
+    (ic_box) сдвиг на нецелое число ячеек дает осцилляции Гиббса, поэтому
+    эталоном там служит exact_solution.
+
+    Используется только в compare_schemes(reference='spectral'). В
+    run_experiment сетка np.linspace(0, L, nx) не периодична с периодом
+    nx·dx даже для ic_sine, и срезы сравниваются с exact_solution — это
+    O(nx) на срез против O(nx log nx) у БПФ.
+    """
+
+    def __init__(self, u0, dx, c=c):
+        u0 = np.asarray(u0, dtype=float)
+        self.nx = u0.shape[-1]
+        self.c = c
+        self._spectrum = np.fft.rfft(u0, axis=-1)
+        self._k = 2 * np.pi * np.fft.rfftfreq(self.nx, d=dx)
+
+    def at(self, t):
+        """Решение в моменты t: форма u0.shape для скаляра, (len(t),) + u0.shape для массива."""
+        t = np.asarray(t, dtype=float)
+        phase = np.exp(-1j * np.multiply.outer(t, self._k) * self.c)
+        if self._spectrum.ndim > 1 and t.ndim > 0:
+            # Моменты времени — первая ось, строки u0 — следующие
+            phase = phase.reshape(t.shape + (1,) * (self._spectrum.ndim - 1) + self._k.shape)
+        return np.fft.irfft(self._spectrum * phase, n=self.nx, axis=-1)
+
+
+def error_norms(u, reference, dx):
+    """Ошибки в нормах L1, L2 и максимума по последней оси."""
+    diff = np.abs(np.asarray(u) - reference)
+    return dict(
+        L1=np.sum(diff, axis=-1) * dx,
+        L2=np.sqrt(np.sum(diff**2, axis=-1) * dx),
+        Linf=np.max(diff, axis=-1),
+    )
+
+
+# --- Хранилище истории на диске ---
+class HistoryStore:
+    """
+    История решения по шагам в виде блоков на диске вместо массива (nt, nx) в памяти.
+
+    Сохраняется каждый stride-й шаг (и шаги с force=True); строки копятся в
+    буфере из chunk_size срезов и записываются блоком: chunk_XXXXX.npz со
+    сжатием или chunk_XXXXX.npy без сжатия (читается через memmap). Номера
+    шагов — в meta.json. Чтение ленивое: загружается только блок с нужным
+    срезом, последний прочитанный блок кешируется.
+    """
+
+    def __init__(self, directory, stride=1, chunk_size=128, compress=True):
+        self.directory = directory
+        self.stride = stride
+        self.chunk_size = chunk_size
+        self.compress = compress
+        self.steps = []
+        self._buffer = []
+        self._n_chunks = 0
+        self._cache = (None, None)
+
+        # Новая запись заменяет старую историю в той же папке
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, 'chunk_*')) + glob.glob(os.path.join(directory, 'meta.json')):
+            os.remove(path)
+
+    @classmethod
+    def open(cls, directory):
+        """Открытие ранее записанной истории только для чтения."""
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        store = cls.__new__(cls)
+        store.directory = directory
+        store.stride, store.chunk_size, store.compress = meta['stride'], meta['chunk_size'], meta['compress']
+        store.steps = meta['steps']
+        store._buffer = []
+        store._n_chunks = meta['n_chunks']
+        store._cache = (None, None)
+        return store
+
+    def _chunk_path(self, i):
+        return os.path.join(self.directory, f"chunk_{i:05d}.{'npz' if self.compress else 'npy'}")
+
+    def append(self, n, u, force=False):
+        """Сохраняет u как шаг n, если n кратно stride или force=True."""
+        if n % self.stride != 0 and not force:
+            return False
+        self.steps.append(n)
+        self._buffer.append(np.array(u, dtype=float))
+        if len(self._buffer) == self.chunk_size:
+            self._write_chunk()
+        return True
+
+    def _write_chunk(self):
+        block = np.stack(self._buffer)
+        path = self._chunk_path(self._n_chunks)
+        if self.compress:
+            np.savez_compressed(path, data=block)
+        else:
+            np.save(path, block)
+        self._n_chunks += 1
+        self._buffer = []
+
+    def close(self):
+        """Дописывает неполный блок и метаданные."""
+        if self._buffer:
+            self._write_chunk()
+        meta = dict(stride=self.stride, chunk_size=self.chunk_size, compress=self.compress,
+                    n_chunks=self._n_chunks, steps=self.steps)
+        with open(os.path.join(self.directory, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    def _chunk(self, i):
+        if self._cache[0] != i:
+            path = self._chunk_path(i)
+            if self.compress:
+                with np.load(path) as data:
+                    block = data['data']
+            else:
+                block = np.load(path, mmap_mode='r')
+            self._cache = (i, block)
+        return self._cache[1]
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __getitem__(self, k):
+        """k-й сохраненный срез."""
+        k = range(len(self.steps))[k]
+        chunk, row = divmod(k, self.chunk_size)
+        if chunk == self._n_chunks:
+            # Еще не записанный блок
+            return self._buffer[row]
+        return np.asarray(self._chunk(chunk)[row])
+
+    def at_step(self, n):
+        """Срез, сохраненный для шага n."""
+        return self[self.steps.index(n)]
+
+
+# --- Точность против затрат ---
+
+
+def compare_schemes(
+    initial_condition_func,           # начальное условие ic(x, L)
+    schemes=tuple(SCHEMES),           # имена схем из SCHEMES
+    nx_values=(50, 100, 200, 400, 800, 1600),  # размеры сетки
+    t_end=L / c,                      # время сравнения (по умолчанию один период)
+    cfl=CFL,                          # число Куранта
+    reference='exact'                 # 'exact' — u0(x - c·t), 'spectral' — SpectralShift (только гладкие НУ)
+):
+    """
+    Ошибка (норма L1) против процессорного времени для каждой схемы и сетки.
+
+    Сетка строго периодическая: x_i = i·L/nx. Шаг dt подправляется так,
+    чтобы ровно попасть в t_end. Возвращает список словарей
+    scheme, nx, n_steps, error, cpu_time.
+    """
+    if reference == 'spectral' and initial_condition_func not in SMOOTH_INITIAL_CONDITIONS:
+        raise ValueError(
+            f"Эталон 'spectral' верен только для гладких НУ, "
+            f"{initial_condition_func.__name__} разрывно — используйте reference='exact'"
+        )
+    records = []
+    for nx_ in nx_values:
+        dx_ = L / nx_
+        x = np.arange(nx_) * dx_
+        u0 = initial_condition_func(x, L)
+        if reference == 'spectral':
+            # Для гладких периодических НУ совпадает с точным до округления
+            exact = SpectralShift(u0, dx_).at(t_end)
+        else:
+            exact = exact_solution(initial_condition_func, x, t_end)
+        n_steps = int(np.ceil(t_end / (cfl * dx_ / c)))
+        nu_ = c * (t_end / n_steps) / dx_
+        for scheme in schemes:
+            start = time.process_time()
+            u = advance(scheme, u0, nu_, n_steps)
+            cpu_time = time.process_time() - start
+            error = np.sum(np.abs(u - exact)) * dx_
+            records.append(dict(scheme=scheme, nx=nx_, n_steps=n_steps, error=error, cpu_time=cpu_time))
+    return records
+
+
+def cheapest_scheme(records, error_target):
+    """Запись с наименьшим временем среди тех, что укладываются в error_target."""
+    passing = [record for record in records if record['error'] <= error_target]
+    return min(passing, key=lambda record: record['cpu_time']) if passing else None
+
+
+def plot_accuracy_vs_cost(records, path, title=''):
+    plt.figure(figsize=(9, 6))
+    for scheme in dict.fromkeys(record['scheme'] for record in records):
+        rows = [record for record in records if record['scheme'] == scheme]
+        plt.loglog([r['cpu_time'] for r in rows], [r['error'] for r in rows], 'o-', label=scheme)
+    plt.xlabel('Процессорное время, с')
+    plt.ylabel('Ошибка L1')
+    plt.title(title)
+    plt.grid(True, which='both', alpha=0.4)
+    plt.legend(fontsize=8)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def run_scheme_comparison(error_target=1e-2):
+    os.makedirs("lab5/scheme_comparison", exist_ok=True)
+    for name, initial_condition_func in INITIAL_CONDITIONS.items():
+        records = compare_schemes(initial_condition_func)
+        plot_accuracy_vs_cost(records, f"lab5/scheme_comparison/{name}.png", f'Точность против затрат — {name}')
+        best = cheapest_scheme(records, error_target)
+        print(f"--- {name}: ошибка L1 через один период ---")
+        for record in records:
+            print(f"  {record['scheme']:18s} nx={record['nx']:5d}  ошибка={record['error']:.2e}  время={record['cpu_time'] * 1e3:8.2f} мс")
+        if best is None:
+            print(f"  Ни одна схема не достигла ошибки {error_target:g}")
+        else:
+            print(f"  Самая дешевая схема с ошибкой <= {error_target:g}: {best['scheme']} (nx={best['nx']})")
+
+
+def run_experiment(
+    experiment_name,           # имя эксперимента (папка lab5/experiment_<имя>)
+    initial_condition_func,    # начальное условие ic(x, L)
+    history_stride=1,          # сохранять в историю каждый history_stride-й шаг
+    history_compress=True      # сжатые блоки .npz или .npy с чтением через memmap
+):
 
     output_dir = f"lab5/experiment_{experiment_name}"
     os.makedirs(output_dir, exist_ok=True)
@@ -41,22 +484,23 @@ def run_experiment(experiment_name, initial_condition_func):
     plt.savefig(os.path.join(output_dir, '01_initial_condition.png'))
     plt.close() 
 
-    history_explicit_upwind = np.zeros((nt, nx))
-    history_implicit_centered = np.zeros((nt, nx))
+    # История на диске блоками; срезы по периодам сохраняются всегда
+    history_explicit_upwind = HistoryStore(os.path.join(output_dir, "history_explicit"), history_stride, compress=history_compress)
+    history_implicit_centered = HistoryStore(os.path.join(output_dir, "history_implicit"), history_stride, compress=history_compress)
 
     u_exp = u0.copy()
+    u_exp_next = np.empty_like(u0)  # второй буфер явной схемы
     u_imp = u0.copy()
-    history_explicit_upwind[0, :] = u0
-    history_implicit_centered[0, :] = u0
-
-    A = np.zeros((nx, nx))
-    nu_half = nu / 2
-    A += np.diag(np.ones(nx))  
-    A += np.diag(np.ones(nx - 1) * nu_half, k=1)  
-    A += np.diag(np.ones(nx - 1) * -nu_half, k=-1) 
+    history_explicit_upwind.append(0, u0)
+    history_implicit_centered.append(0, u0)
 
-    A[0, -1] = -nu_half
-    A[-1, 0] = nu_half
+    # Циклическая трехдиагональная матрица неявной схемы: факторизуется
+    # один раз, хранятся только диагонали
+    implicit_solver = implicit_centered_solver(nu, nx)
+    # Эталон для срезов: точный перенос u0 с периодом схем nx·dx. На этой
+    # сетке x = 0 и x = L — разные узлы, поэтому даже ic_sine не гладкая с
+    # периодом nx·dx, и SpectralShift дал бы осцилляции Гиббса
+    reference_period = nx * dx
     
     print(f"Running simulation for {experiment_name} and saving slices/frames...")
     period_duration = L / c
@@ -67,19 +511,19 @@ def run_experiment(experiment_name, initial_condition_func):
     animation_frame_counter = 0
  
     slice_times = []
-    slice_explicit = []
-    slice_implicit = []
+    slice_steps = []
+    slice_errors = []
     
     for n in range(1, nt):
         current_time_s = n * dt
         # 1) Явный метод Эйлера с разностями против потока
-        un_exp = u_exp.copy()
-        for i in range(nx): # Assumes periodic BC due to u_exp[i-1] for i=0
-            u_exp[i] = un_exp[i] - nu * (un_exp[i] - un_exp[i-1])
-        history_explicit_upwind[n, :] = u_exp
+        upwind_step(u_exp, u_exp_next, nu) # периодичность: u_{-1} = u_{nx-1}
+        u_exp, u_exp_next = u_exp_next, u_exp
+        u_imp = implicit_solver.solve(u_imp) # u_imp from previous step is used as b for next
 
-        u_imp = np.linalg.solve(A, u_imp) # u_imp from previous step is used as b for next
-        history_implicit_centered[n, :] = u_imp
+        is_slice = current_time_s >= next_save_time_target_s - dt / 2 # dt/2 for tolerance
+        history_explicit_upwind.append(n, u_exp, force=is_slice)
+        history_implicit_centered.append(n, u_imp, force=is_slice)
 
         if n % save_frame_interval == 0:
             # Explicit method frame
@@ -107,11 +551,16 @@ def run_experiment(experiment_name, initial_condition_func):
             plt.close()
             animation_frame_counter += 1
 
-        if current_time_s >= next_save_time_target_s - dt / 2: # dt/2 for tolerance
-            # Сохраняем значения для общего графика
+        if is_slice:
+            # Для общего графика запоминается только шаг: срез лежит в истории
             slice_times.append(current_time_s)
-            slice_explicit.append(u_exp.copy())
-            slice_implicit.append(u_imp.copy())
+            slice_steps.append(n)
+            u_ref = exact_solution(initial_condition_func, x_space, current_time_s, period=reference_period)
+            slice_errors.append(dict(
+                time=current_time_s,
+                explicit=error_norms(u_exp, u_ref, dx),
+                implicit=error_norms(u_imp, u_ref, dx),
+            ))
             
             # Сохранение среза для явного метода
             plt.figure(figsize=(8, 5))
@@ -138,11 +587,14 @@ def run_experiment(experiment_name, initial_condition_func):
             plt.close()
             
             print(f"  Saved slices for t ~ {current_time_s:.2f}s (target period {period_save_counter}, time {next_save_time_target_s:.2f}s) for {experiment_name}")
+            print(f"    L1 error vs exact solution: explicit {slice_errors[-1]['explicit']['L1']:.3e}, implicit {slice_errors[-1]['implicit']['L1']:.3e}")
             next_save_time_target_s += period_duration
             period_save_counter += 1
             if next_save_time_target_s > T + dt/2: # Stop if we've passed all desired save times
                 break
     
+    history_explicit_upwind.close()
+    history_implicit_centered.close()
     print(f"--- Симуляция для эксперимента '{experiment_name}' завершена. Создание GIF-анимаций... ---")
 
     # Create GIF for Explicit Method
@@ -174,10 +626,10 @@ def run_experiment(experiment_name, initial_condition_func):
 
 
     # Итоговый график для всех срезов (Explicit)
-    if slice_explicit:
+    if slice_steps:
         plt.figure(figsize=(10, 6))
-        for i, u in enumerate(slice_explicit):
-            plt.plot(x_space, u, label=f't={slice_times[i]:.2f}s')
+        for i, step in enumerate(slice_steps):
+            plt.plot(x_space, history_explicit_upwind.at_step(step), label=f't={slice_times[i]:.2f}s')
         plt.xlabel('Пространство (x)')
         plt.ylabel('Величина (u)')
         plt.title(f'Explicit Upwind: все срезы — {experiment_name}')
@@ -189,10 +641,10 @@ def run_experiment(experiment_name, initial_condition_func):
         plt.close()
         
     # Итоговый график для всех срезов (Implicit)
-    if slice_implicit:
+    if slice_steps:
         plt.figure(figsize=(10, 6))
-        for i, u in enumerate(slice_implicit):
-            plt.plot(x_space, u, label=f't={slice_times[i]:.2f}s')
+        for i, step in enumerate(slice_steps):
+            plt.plot(x_space, history_implicit_centered.at_step(step), label=f't={slice_times[i]:.2f}s')
         plt.xlabel('Пространство (x)')
         plt.ylabel('Величина (u)')
         plt.title(f'Implicit Centered: все срезы — {experiment_name}')
@@ -204,6 +656,7 @@ def run_experiment(experiment_name, initial_condition_func):
         plt.close()
 
     print(f"--- Эксперимент '{experiment_name}' полностью завершен (включая GIF). ---\\n")
+    return slice_errors
 
 
 def ic_box(x, L):
@@ -220,10 +673,19 @@ def ic_sine(x, L):
     """Одна полная волна синусоиды"""
     return 1.5 + 0.5 * np.sin(2 * np.pi * x / L)
 
+INITIAL_CONDITIONS = {
+    'box': ic_box,
+    'gaussian': ic_gaussian,
+    'sine': ic_sine,
+}
+
+# Гладкие и L-периодические НУ, для которых SpectralShift — точный эталон
+SMOOTH_INITIAL_CONDITIONS = (ic_gaussian, ic_sine)
+
 
 if __name__ == '__main__':
-    run_experiment("box", ic_box)
-    run_experiment("gaussian", ic_gaussian)
-    run_experiment("sine", ic_sine)
+    for name, initial_condition_func in INITIAL_CONDITIONS.items():
+        run_experiment(name, initial_condition_func)
+    run_scheme_comparison()
     
     print("Все эксперименты завершены.")
\ No newline at end of file
@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+
+# Лабораторные — отдельные скрипты, поэтому их папки добавляются в путь
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+for lab in ('lab1', 'lab2', 'lab3', 'lab4'):
+    sys.path.insert(0, os.path.join(ROOT_DIR, lab))
+
+import lab1
+import lab2
+import lab3
+import lab4
+from common.rendering import RenderQueue
+
+LABS = dict(lab1=lab1, lab2=lab2, lab3=lab3, lab4=lab4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Перерисовка всех графиков лабораторных без дисплея")
+    parser.add_argument('--output', default=os.path.join(ROOT_DIR, 'figures'), help="папка для графиков")
+    parser.add_argument('--formats', nargs='+', default=['png'], help="форматы файлов, например png svg")
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None, help="число процессов (по умолчанию по числу ядер)")
+    parser.add_argument('--labs', nargs='+', default=list(LABS), choices=list(LABS))
+    args = parser.parse_args()
+
+    queue = RenderQueue(formats=args.formats, dpi=args.dpi)
+    for name in args.labs:
+        LABS[name].add_plot_jobs(queue, os.path.join(args.output, name))
+
+    print(f"Графиков в очереди: {len(queue.jobs)}")
+    for path in queue.run(workers=args.workers):
+        print(f"Сохранено: {path}")
+
+
+if __name__ == '__main__':
+    main()